@@ -0,0 +1,90 @@
+from collections import OrderedDict
+import numpy as np
+from curve_kernels import bernstein_matrix, bspline_basis_indexed, clamped_uniform_knots
+
+
+class BasisCache:
+    """Bounded LRU cache of basis matrices; they depend on the curve topology, never on point coordinates"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, factory):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        value = factory()
+        arrays = value if isinstance(value, tuple) else (value,)
+        for array in arrays:
+            array.setflags(write=False)
+
+        size = sum(array.nbytes for array in arrays)
+        if size <= self.max_bytes:
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            self.evict()
+        return value
+
+    def evict(self):
+        while self.current_bytes > self.max_bytes and self.entries:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def clear(self):
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+
+basis_cache = BasisCache()
+
+
+def bezier_basis(n, num_samples):
+    return basis_cache.get(
+        ('bezier', n, num_samples),
+        lambda: bernstein_matrix(n, np.linspace(0, 1, num_samples))
+    )
+
+
+def bspline_basis(n, degree, num_samples, knots=None):
+    """knots=None means clamped uniform knots; any other knot vector becomes part of the cache key"""
+    if knots is None:
+        return basis_cache.get(
+            ('bspline', n, degree, num_samples),
+            lambda: bspline_basis_indexed(clamped_uniform_knots(n, degree), degree, n,
+                                          np.linspace(0, 1, num_samples))
+        )
+    return basis_cache.get(
+        ('bspline', n, degree, num_samples, knots.tobytes()),
+        lambda: bspline_basis_indexed(knots, degree, n, np.linspace(0, 1, num_samples))
+    )
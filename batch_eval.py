@@ -0,0 +1,117 @@
+"""Headless batch tessellation of Bézier and B-Spline curves.
+
+Reads JSON Lines records such as
+    {"type": "bspline", "points": [[0, 0], [1, 2], ...], "degree": 3, "samples": 300}
+and writes one {"id": ..., "points": [[x, y], ...]} line per input curve, in input order.
+Only NumPy is needed: neither matplotlib nor tkinter is imported.
+"""
+import argparse
+import json
+import sys
+from itertools import islice
+import numpy as np
+from basis_cache import bezier_basis, bspline_basis
+from kernel_backends import kernels
+from bezier_curve import BezierCurve
+from bspline_curve import BSplineCurve
+
+
+def evaluate_batch(kind, points, degree=3, num_samples=None):
+    """Evaluate a stack of curves sharing one topology: points (k, n, 2) -> (k, m, 2)"""
+    points = np.asarray(points, dtype=float)
+    n = points.shape[-2]
+    
+    if kind == 'bezier':
+        num_samples = num_samples or BezierCurve.num_samples
+        if n < 2:
+            return points
+        return bezier_basis(n, num_samples) @ points
+    
+    if kind == 'bspline':
+        num_samples = num_samples or BSplineCurve.num_samples
+        if n <= degree:
+            return points
+        indices, basis = bspline_basis(n, degree, num_samples)
+        return kernels.apply_local_basis(indices, basis, points)
+    
+    raise ValueError(f"Unknown curve type: {kind!r}")
+
+
+def group_key(record):
+    kind = record.get('type', 'bezier')
+    degree = record.get('degree', 3) if kind == 'bspline' else None
+    return kind, degree, len(record['points']), record.get('samples')
+
+
+def evaluate_chunk(records, evaluate=evaluate_batch):
+    """Evaluate a list of records grouped by (type, degree, n, samples); results keep input order"""
+    groups = {}
+    for position, record in enumerate(records):
+        groups.setdefault(group_key(record), []).append(position)
+    
+    results = [None] * len(records)
+    for (kind, degree, _, num_samples), positions in groups.items():
+        stack = np.array([records[p]['points'] for p in positions], dtype=float)
+        samples = evaluate(kind, stack, 3 if degree is None else degree, num_samples)
+        for p, curve_samples in zip(positions, samples):
+            results[p] = curve_samples
+    return results
+
+
+def evaluate_records(records, chunk_size=10000, evaluate=evaluate_batch):
+    """Stream (record, samples) pairs; at most chunk_size records are held in memory"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield from zip(chunk, evaluate_chunk(chunk, evaluate))
+
+
+def read_records(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def write_records(stream, results, start_id=0):
+    for index, (record, samples) in enumerate(results, start=start_id):
+        output = {'id': record.get('id', index), 'points': samples.tolist()}
+        stream.write(json.dumps(output) + '\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Tessellate Bézier and B-Spline curves without a GUI')
+    parser.add_argument('input', help="JSON Lines file of curves ('-' for stdin)")
+    parser.add_argument('output', help="JSON Lines file of sampled polylines ('-' for stdout)")
+    parser.add_argument('--chunk-size', type=int, default=10000,
+                        help='number of curves evaluated together (bounds memory use)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for large groups of curves (0 = all cores)')
+    parser.add_argument('--task-size', type=int, default=1024,
+                        help='curves per worker task')
+    args = parser.parse_args(argv)
+    
+    tessellator = None
+    evaluate = evaluate_batch
+    if args.workers != 1:
+        from parallel_eval import ParallelTessellator
+        tessellator = ParallelTessellator(args.workers or None, args.task_size)
+        evaluate = tessellator.evaluate
+    
+    source = sys.stdin if args.input == '-' else open(args.input)
+    target = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        write_records(target, evaluate_records(read_records(source), args.chunk_size, evaluate))
+    finally:
+        if tessellator is not None:
+            tessellator.close()
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Benchmarks for the evaluation, rendering and interaction hot paths.
+
+    python benchmark.py [--quick] [--filter bspline] [--output results.json]
+    python benchmark.py --baseline results.json [--tolerance 1.2]
+    python benchmark.py --backend numba
+
+Each case is swept over control-point count, degree and sample count and reports latency
+percentiles, throughput and peak traced memory. Rendering runs on the headless Agg backend.
+With --baseline, any case whose median latency grows past the tolerance is flagged and the
+exit code is 1.
+"""
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from bezier_curve import BezierCurve
+from bspline_curve import BSplineCurve
+from batch_eval import evaluate_batch
+from curve_renderer import CurveRenderer
+from decasteljau_animator import DeCasteljauAnimator
+from kernel_backends import backend_info, set_backend
+
+
+def random_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([np.linspace(0.5, 5.5, n), rng.uniform(0.5, 4.5, n)])
+
+
+def bezier_evaluate_curve(n, samples):
+    curve = BezierCurve(random_points(n))
+    curve.incremental = False
+    return lambda: curve.evaluate_curve(samples)
+
+
+def bezier_all_levels(n):
+    curve = BezierCurve(random_points(n))
+    return lambda: curve.de_casteljau_all_levels(curve.points, 0.37)
+
+
+def bspline_basis_function(n, degree):
+    curve = BSplineCurve(random_points(n), degree)
+    knots = curve.generate_knots(n, degree)
+    return lambda: curve.basis_function(n // 2, degree, 0.5, knots)
+
+
+def bspline_evaluate_curve(n, degree, samples):
+    curve = BSplineCurve(random_points(n), degree)
+    curve.incremental = False
+    return lambda: curve.evaluate_curve(samples)
+
+
+def batch_bspline(n, curves):
+    rng = np.random.default_rng(0)
+    stack = rng.uniform(0, 5, (curves, n, 2))
+    return lambda: evaluate_batch('bspline', stack, 3)
+
+
+def bspline_drag(n, degree, samples):
+    """One drag frame: move a point, then re-evaluate (incremental dirty-region path)"""
+    curve = BSplineCurve(random_points(n), degree)
+    curve.evaluate_curve(samples)
+    rng = np.random.default_rng(1)
+    
+    def step():
+        index = int(rng.integers(n))
+        curve.update_point(index, *curve.points[index] + rng.normal(0, 0.01, 2))
+        curve.evaluate_curve(samples)
+    return step
+
+
+def convex_hull_drag(n):
+    curve = BSplineCurve(random_points(n))
+    curve.show_hull = True
+    curve.compute_convex_hull()
+    rng = np.random.default_rng(2)
+    
+    def step():
+        index = int(rng.integers(n))
+        curve.update_point(index, *rng.uniform(0.5, 5.5, 2))
+        curve.compute_convex_hull()
+    return step
+
+
+def convex_hull_full(n):
+    curve = BSplineCurve(random_points(n))
+    
+    def step():
+        curve.hull.invalidate()
+        curve.compute_convex_hull()
+    return step
+
+
+def render_curve(n):
+    fig, ax = plt.subplots(figsize=(10, 8))
+    renderer = CurveRenderer(ax, 'Benchmark')
+    curve = BSplineCurve(random_points(n))
+    renderer.render_curve(curve)
+    fig.canvas.draw()
+    rng = np.random.default_rng(3)
+    
+    def step():
+        index = int(rng.integers(n))
+        curve.update_point(index, *curve.points[index] + rng.normal(0, 0.01, 2))
+        renderer.render_curve(curve)
+    return step
+
+
+def render_frame(n):
+    """render_curve plus a full Agg draw of the figure"""
+    render = render_curve(n)
+    figure = plt.gcf()
+    
+    def step():
+        render()
+        figure.canvas.draw()
+    return step
+
+
+def draw_construction_step(n):
+    fig, ax = plt.subplots()
+    animator = DeCasteljauAnimator(ax, BezierCurve(random_points(n)))
+    animator.use_frame_cache = False
+    t_values = itertools.cycle(np.linspace(0, 1, 50))
+    return lambda: animator.draw_construction_step(next(t_values))
+
+
+def animate_frame(n):
+    fig, ax = plt.subplots()
+    animator = DeCasteljauAnimator(ax, BezierCurve(random_points(n)))
+    frames = itertools.cycle(range(int(1.0 / animator.animation_speed)))
+    return lambda: animator.animate_frame(next(frames))
+
+
+SWEEPS = {
+    'full': {'n': [4, 16, 64, 256], 'degree': [3, 5], 'samples': [200, 1000], 'curves': [100, 10000]},
+    'quick': {'n': [8, 64], 'degree': [3], 'samples': [200], 'curves': [1000]}
+}
+
+CASES = [
+    ('bezier.evaluate_curve', bezier_evaluate_curve, ['n', 'samples']),
+    ('bezier.de_casteljau_all_levels', bezier_all_levels, ['n']),
+    ('bspline.basis_function', bspline_basis_function, ['n', 'degree']),
+    ('bspline.evaluate_curve', bspline_evaluate_curve, ['n', 'degree', 'samples']),
+    ('bspline.drag', bspline_drag, ['n', 'degree', 'samples']),
+    ('batch.bspline', batch_bspline, ['n', 'curves']),
+    ('hull.drag', convex_hull_drag, ['n']),
+    ('hull.full', convex_hull_full, ['n']),
+    ('renderer.render_curve', render_curve, ['n']),
+    ('renderer.frame', render_frame, ['n']),
+    ('animator.draw_construction_step', draw_construction_step, ['n']),
+    ('animator.animate_frame', animate_frame, ['n'])
+]
+
+
+def expand(sweep, names):
+    for values in itertools.product(*(sweep[name] for name in names)):
+        params = dict(zip(names, values))
+        if params.get('degree', 0) < params['n']:
+            yield params
+
+
+def run_case(factory, params, min_time, max_repeats):
+    step = factory(**params)
+    step()
+    
+    latencies = []
+    deadline = time.perf_counter() + min_time
+    while len(latencies) < max_repeats and (len(latencies) < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter_ns()
+        step()
+        latencies.append(time.perf_counter_ns() - start)
+    
+    tracemalloc.start()
+    step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    plt.close('all')
+    
+    latencies_ms = np.array(latencies) / 1e6
+    return {
+        'runs': len(latencies),
+        'mean_ms': float(latencies_ms.mean()),
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p90_ms': float(np.percentile(latencies_ms, 90)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'throughput_per_s': float(1000 / latencies_ms.mean()),
+        'peak_memory_kb': peak / 1024
+    }
+
+
+def result_key(result):
+    return result['case'], tuple(sorted(result['params'].items()))
+
+
+def compare(results, baseline, tolerance):
+    reference = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        before = reference.get(result_key(result))
+        if before is None:
+            continue
+        ratio = result['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 1.0
+        result['baseline_ratio'] = ratio
+        if ratio > tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark curve evaluation, rendering and interaction')
+    parser.add_argument('--quick', action='store_true', help='small sweep for a fast sanity run')
+    parser.add_argument('--filter', default='', help='only run cases whose name contains this text')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds spent timing each case')
+    parser.add_argument('--max-repeats', type=int, default=2000)
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.2,
+                        help='allowed median slowdown factor against the baseline')
+    parser.add_argument('--backend', choices=['auto', 'numpy', 'numba'],
+                        help='kernel backend (default: CURVE_KERNEL_BACKEND or auto)')
+    args = parser.parse_args(argv)
+    if args.backend:
+        set_backend(args.backend)
+    kernel_info = backend_info()
+    print(f"kernel backend: {kernel_info['active']}")
+    
+    sweep = SWEEPS['quick' if args.quick else 'full']
+    results = []
+    for name, factory, param_names in CASES:
+        if args.filter not in name:
+            continue
+        for params in expand(sweep, param_names):
+            result = {'case': name, 'params': params}
+            result.update(run_case(factory, params, args.min_time, args.max_repeats))
+            results.append(result)
+            label = ' '.join(f"{k}={v}" for k, v in params.items())
+            print(f"{name:<34} {label:<28} p50 {result['p50_ms']:9.3f} ms  p99 {result['p99_ms']:9.3f} ms  "
+                  f"{result['throughput_per_s']:10.1f}/s  peak {result['peak_memory_kb']:9.1f} KiB")
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for result in regressions:
+            print(f"REGRESSION: {result['case']} {result['params']} is {result['baseline_ratio']:.2f}x slower")
+    
+    if args.output:
+        report = {
+            'meta': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'matplotlib': matplotlib.__version__,
+                'platform': platform.platform(),
+                'backend': matplotlib.get_backend(),
+                'kernels': kernel_info
+            },
+            'results': results
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
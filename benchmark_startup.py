@@ -0,0 +1,105 @@
+"""Startup benchmark: import time of main.py and time to the first rendered frame.
+
+    python benchmark_startup.py [--output startup.json] [--baseline startup.json] [--tolerance 1.25]
+
+Fails (exit code 1) when a lazily loaded module is imported at startup or when a timing
+regresses by more than the tolerance against the baseline.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Loaded on first use only: hull display, add-point dialog, non-blitted animation
+LAZY_MODULES = ['scipy', 'tkinter', 'matplotlib.animation', 'numba']
+
+FIRST_FRAME = """
+import json, sys, time
+start = time.perf_counter()
+from main import InteractiveCurves
+imported = time.perf_counter()
+curves = InteractiveCurves()
+curves.fig.canvas.draw()
+drawn = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_frame_s': drawn - start,
+    'modules': sorted(sys.modules)
+}))
+"""
+
+
+def run_python(code, *flags):
+    env = dict(os.environ, MPLBACKEND='Agg')
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=ROOT, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+def import_profile(top=10):
+    """Self time per module from -X importtime, heaviest first"""
+    stderr = run_python('import main', '-X', 'importtime').stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us)))
+    
+    total_ms = sum(us for _, us in modules) / 1000
+    heaviest = sorted(modules, key=lambda m: m[1], reverse=True)[:top]
+    return total_ms, [{'module': name, 'self_ms': us / 1000} for name, us in heaviest]
+
+
+def measure(repeats):
+    runs = [json.loads(run_python(FIRST_FRAME).stdout) for _ in range(repeats)]
+    loaded = set(runs[0]['modules'])
+    eager = [m for m in LAZY_MODULES if any(name == m or name.startswith(m + '.') for name in loaded)]
+    total_ms, heaviest = import_profile()
+    return {
+        'import_ms': float(np.median([r['import_s'] for r in runs]) * 1000),
+        'first_frame_ms': float(np.median([r['first_frame_s'] for r in runs]) * 1000),
+        'importtime_total_ms': total_ms,
+        'heaviest_imports': heaviest,
+        'eager_lazy_modules': eager
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure cold start of the interactive application')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='allowed slowdown factor against the baseline')
+    args = parser.parse_args(argv)
+    
+    results = measure(args.repeats)
+    print(f"import main:      {results['import_ms']:8.1f} ms")
+    print(f"first frame:      {results['first_frame_ms']:8.1f} ms")
+    print(f"-X importtime:    {results['importtime_total_ms']:8.1f} ms")
+    for entry in results['heaviest_imports']:
+        print(f"    {entry['module']:<40} {entry['self_ms']:8.1f} ms")
+    
+    failures = [f"{m} is imported at startup" for m in results['eager_lazy_modules']]
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in ['import_ms', 'first_frame_ms']:
+            if results[key] > baseline[key] * args.tolerance:
+                failures.append(f"{key} regressed: {results[key]:.1f} ms vs {baseline[key]:.1f} ms baseline")
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,107 @@
 import numpy as np
 from curve_base import CurveBase
+from basis_cache import bezier_basis
+import bezier_ops
+from kernel_backends import kernels
+from curve_kernels import homogenize, bezier_derivative, split_bezier, boxes_intersect, boxes_inside, merge_ranges
 
 
 class BezierCurve(CurveBase):
-    def __init__(self, initial_points=None, color='#45B7D1'):
+    num_samples = 200
+    
+    def __init__(self, initial_points=None, color='#45B7D1', copy=True):
         if initial_points is None:
             initial_points = [[1, 2], [2, 4], [4, 1], [5, 3]]
-        super().__init__(initial_points, color)
+        super().__init__(initial_points, color, copy)
     
     def de_casteljau(self, points, t):
         """Algoritmul De Casteljau pentru curbele Bezier"""
-        if len(points) == 1:
-            return points[0]
-
-        new_points = []
-        for i in range(len(points) - 1):
-            new_point = (1 - t) * points[i] + t * points[i + 1]
-            new_points.append(new_point)
-        
-        return self.de_casteljau(new_points, t)
+        return kernels.de_casteljau_batch(np.asarray(points, dtype=float), [t])[0]
     
     def de_casteljau_all_levels(self, points, t):
-        levels = [np.array(points)]
-        current_points = np.array(points)
-        
-        while len(current_points) > 1:
-            new_points = []
-            for i in range(len(current_points) - 1):
-                new_point = (1 - t) * current_points[i] + t * current_points[i + 1]
-                new_points.append(new_point)
-            current_points = np.array(new_points)
-            levels.append(current_points)
-        
-        return levels
+        points = np.asarray(points, dtype=float)
+        levels = kernels.de_casteljau_levels_batch(points, [t])[0]
+        return [levels[r, :len(points) - r] for r in range(len(points))]
     
-    def evaluate_curve(self, num_points=200):
+    def update_samples(self, num_points=200):
         if len(self.points) < 2:
             return self.points
             
-        t_values = np.linspace(0, 1, num_points)
-        curve_points = []
+        basis = bezier_basis(len(self.points), num_points)
+        if not self.incremental:
+            self.samples = None
+            return basis @ self.points
+
+        # Every Bernstein polynomial is non-zero on (0, 1), so a moved point dirties the whole
+        # curve; the sample buffer is still reused instead of reallocated
+        if self.samples is None or len(self.samples) != num_points:
+            self.samples = np.empty((num_points, 2))
+        elif not self.dirty_points:
+            return self.samples
+        np.matmul(basis, self.points, out=self.samples)
+
+        self.dirty_points.clear()
+        self.mark_dirty_rows(slice(0, num_points))
+        return self.samples
+    
+    def evaluate_at(self, t_values):
+        if len(self.points) < 2:
+            return self.points
+        return kernels.de_casteljau_batch(self.points, t_values)
+    
+    def derivative(self, t_values, order=1):
+        """order-th derivative at t (scalar or array), evaluated on the hodograph control points"""
+        return bezier_derivative(self.points, t_values, order)
+    
+    def evaluate_rows(self, rows, num_points):
+        return bezier_basis(len(self.points), num_points)[rows] @ self.points
+    
+    def to_bezier_segments(self):
+        """Bézier segments (k, n, 2) and the parameter range (k, 2) each one covers"""
+        if len(self.points) < 2:
+            return np.empty((0, len(self.points), 2)), np.empty((0, 2))
+        return self.points[np.newaxis].copy(), np.array([[0.0, 1.0]])
+    
+    def rational_bezier_segments(self):
+        segments, ranges = self.to_bezier_segments()
+        return homogenize(segments, np.ones(segments.shape[:-1])), ranges
+    
+    def split(self, t=0.5):
+        left, right = bezier_ops.split(self.points, t)
+        return BezierCurve(left, self.color), BezierCurve(right, self.color)
+    
+    def subcurve(self, t0, t1):
+        return BezierCurve(bezier_ops.subcurve(self.points, t0, t1), self.color)
+    
+    def elevate_degree(self, times=1):
+        """Add control points without changing the shape of the curve"""
+        self.points = bezier_ops.elevate_degree(self.points, times)
+    
+    def reduce_degree(self, degree=None, preserve_endpoints=True):
+        """Drop control points, replacing the curve by its least-squares approximation"""
+        self.points = bezier_ops.reduce_degree(self.points, degree, preserve_endpoints)
+    
+    def visible_parameter_ranges(self, xlim, ylim, max_depth=6):
+        """Parameter intervals whose subdivided control polygon can reach the view (convex hull property)"""
+        pieces = self.points[np.newaxis]
+        t_start = np.zeros(1)
+        t_end = np.ones(1)
+        visible = []
         
-        for t in t_values:
-            point = self.de_casteljau(self.points, t)
-            curve_points.append(point)
+        for depth in range(max_depth + 1):
+            lower = pieces.min(axis=1)
+            upper = pieces.max(axis=1)
+            hit = boxes_intersect(lower, upper, xlim, ylim)
+            done = hit & (boxes_inside(lower, upper, xlim, ylim) | (depth == max_depth))
+            visible.append(np.column_stack([t_start[done], t_end[done]]))
+            
+            split = hit & ~done
+            if not split.any():
+                break
+            
+            left, right = split_bezier(pieces[split])
+            t_mid = 0.5 * (t_start[split] + t_end[split])
+            pieces = np.concatenate([left, right])
+            t_start, t_end = np.concatenate([t_start[split], t_mid]), np.concatenate([t_mid, t_end[split]])
         
-        return np.array(curve_points)
\ No newline at end of file
+        return merge_ranges(np.concatenate(visible))
\ No newline at end of file
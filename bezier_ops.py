@@ -0,0 +1,86 @@
+"""Exact Bézier curve operations, batched over stacks of control polygons (..., n, d).
+
+Parameters such as t, t0 and t1 are scalars or one value per curve.
+"""
+import numpy as np
+from basis_cache import basis_cache
+from curve_kernels import bernstein_matrix, split_bezier
+
+
+def split(points, t=0.5):
+    """Left and right control polygons of the curves split at t"""
+    return split_bezier(points, t)
+
+
+def subcurve(points, t0, t1):
+    """Control polygons of the curves restricted to [t0, t1]; t0 > t1 gives the reversed piece"""
+    points = np.asarray(points, dtype=float)
+    t0 = np.asarray(t0, dtype=float)
+    t1 = np.asarray(t1, dtype=float)
+    start, end = np.minimum(t0, t1), np.maximum(t0, t1)
+
+    head, _ = split_bezier(points, end)
+    # Re-parameterise the head piece [0, end] to [0, 1] before cutting off [0, start]
+    local = np.divide(start, end, out=np.zeros(np.broadcast(start, end).shape), where=end > 0)
+    _, piece = split_bezier(head, local)
+
+    reverse = (t0 > t1)[..., np.newaxis, np.newaxis]
+    return np.where(reverse, piece[..., ::-1, :], piece)
+
+
+def elevation_matrix(n, m):
+    """(m, n) matrix raising n control points to m >= n without changing the curve"""
+    def build():
+        matrix = np.eye(n)
+        for k in range(n, m):
+            # One elevation step k -> k + 1 points: Q_i = i/k P_(i-1) + (1 - i/k) P_i
+            alpha = np.arange(k + 1) / k
+            step = np.zeros((k + 1, k))
+            step[np.arange(k), np.arange(k)] = 1 - alpha[:k]
+            step[np.arange(1, k + 1), np.arange(k)] = alpha[1:]
+            matrix = step @ matrix
+        return matrix
+    return basis_cache.get(('elevate', n, m), build)
+
+
+def elevate_degree(points, times=1):
+    """Raise the degree of the curves by times; the curves themselves are unchanged"""
+    points = np.asarray(points, dtype=float)
+    n = points.shape[-2]
+    return elevation_matrix(n, n + times) @ points
+
+
+def reduction_matrix(n, m, preserve_endpoints=True):
+    """(m, n) least-squares map from n control points to m < n, minimising the L2 distance between the curves"""
+    def build():
+        # Gauss-Legendre with n nodes integrates the degree 2(n - 1) squared error exactly
+        nodes, weights = np.polynomial.legendre.leggauss(n)
+        t = 0.5 * (nodes + 1)
+        scale = np.sqrt(0.5 * weights)[:, np.newaxis]
+        source = scale * bernstein_matrix(n, t)
+        target = scale * bernstein_matrix(m, t)
+
+        if not preserve_endpoints or m < 2:
+            return np.linalg.pinv(target) @ source
+
+        # Pin the end points and fit the interior points to what they leave over
+        fixed = np.zeros((m, n))
+        fixed[0, 0] = 1.0
+        fixed[-1, -1] = 1.0
+        residual = source - target @ fixed
+        matrix = fixed.copy()
+        matrix[1:-1] = np.linalg.pinv(target[:, 1:-1]) @ residual
+        return matrix
+    return basis_cache.get(('reduce', n, m, preserve_endpoints), build)
+
+
+def reduce_degree(points, degree=None, preserve_endpoints=True):
+    """Least-squares approximation of the curves by curves of a lower degree (default: one less)"""
+    points = np.asarray(points, dtype=float)
+    n = points.shape[-2]
+    m = n - 1 if degree is None else degree + 1
+    if not 1 <= m <= n:
+        raise ValueError(f"Cannot reduce a degree {n - 1} curve to degree {m - 1}")
+    if m == n:
+        return points.copy()
+    return reduction_matrix(n, m, preserve_endpoints) @ points
@@ -0,0 +1,46 @@
+from frame_profiler import profiler
+
+
+class BlitManager:
+    """Caches the static background of one axes and redraws only its animated artists"""
+    
+    def __init__(self, ax):
+        self.ax = ax
+        self.background = None
+        self.artists = []
+        self.cid = self.canvas.mpl_connect('draw_event', self.on_draw)
+    
+    @property
+    def canvas(self):
+        return self.ax.figure.canvas
+    
+    def on_draw(self, event):
+        # Every full draw (resize, zoom, pan, widget repaint) refreshes the cached background
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_animated()
+    
+    def add_artist(self, artist):
+        artist.set_animated(True)
+        self.artists.append(artist)
+    
+    def remove_artist(self, artist):
+        if artist in self.artists:
+            self.artists.remove(artist)
+    
+    def draw_animated(self):
+        for artist in sorted(self.artists, key=lambda a: a.get_zorder()):
+            self.ax.draw_artist(artist)
+    
+    def update(self):
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        
+        self.canvas.restore_region(self.background)
+        self.draw_animated()
+        self.canvas.blit(self.ax.bbox)
+        self.canvas.flush_events()
+        profiler.frame()
+    
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self.cid)
@@ -1,69 +1,188 @@
 import numpy as np
 from curve_base import CurveBase
+from curve_kernels import homogenize, clamped_uniform_knots, validate_knots, insert_knot, bspline_to_bezier, bspline_derivative, boxes_intersect, merge_ranges
+from basis_cache import bspline_basis
+from kernel_backends import kernels
 
 
 class BSplineCurve(CurveBase):
+    num_samples = 300
  
-    def __init__(self, initial_points=None, degree=3, color='#45B7D1'):
+    def __init__(self, initial_points=None, degree=3, color='#45B7D1', copy=True, knots=None):
         if initial_points is None:
             initial_points = [[0.5, 2], [1.5, 4], [2.5, 1], [3.5, 4.5], [4.5, 2], [5.5, 3]]
-        super().__init__(initial_points, color)
+        self.custom_knots = None
+        self.parameter_domain = (0.0, 1.0)
+        self.uniform_knots = None
+        self.uniform_knots_key = None
+        self.segment_cache = None
+        self.segment_cache_key = None
+        super().__init__(initial_points, color, copy)
         self.degree = degree
+        if knots is not None:
+            self.set_knots(knots)
+    
+    @property
+    def degree(self):
+        return self._degree
+    
+    @degree.setter
+    def degree(self, value):
+        # Samples, arc-length tables and Bézier segments all depend on the degree
+        self._degree = int(value)
+        self.invalidate()
     
     def generate_knots(self, n, p):
-        if n <= p:
-            return np.array([0] * (p + 1) + [1] * (p + 1))
-        
-        knots = []
-        
-        for i in range(p + 1):
-            knots.append(0.0)
-        
-        for i in range(1, n - p):
-            knots.append(i / (n - p))
-        
-        for i in range(p + 1):
-            knots.append(1.0)
+        return clamped_uniform_knots(n, p)
+    
+    def set_knots(self, knots):
+        """Use an arbitrary non-decreasing knot vector (None restores clamped uniform knots).
+
+        The knots are rescaled so that the parameter domain [knots[degree], knots[n]] becomes
+        [0, 1]; the original domain is kept in parameter_domain. Adding or removing a point,
+        or changing the degree, falls back to clamped uniform knots.
+        """
+        if knots is None:
+            self.custom_knots = None
+            self.parameter_domain = (0.0, 1.0)
+        else:
+            n = len(self.points)
+            knots = validate_knots(knots, n, self.degree)
+            start, end = knots[self.degree], knots[n]
+            self.custom_knots = (knots - start) / (end - start)
+            self.custom_knots.setflags(write=False)
+            self.parameter_domain = (float(start), float(end))
+        self.invalidate()
+    
+    @property
+    def knots(self):
+        """Validated knot vector over the normalized domain [0, 1], cached until the topology changes"""
+        n = len(self.points)
+        if self.custom_knots is not None:
+            if len(self.custom_knots) == n + self.degree + 1:
+                return self.custom_knots
+            self.custom_knots = None
+            self.parameter_domain = (0.0, 1.0)
         
-        return np.array(knots)
+        if self.uniform_knots_key != (n, self.degree):
+            self.uniform_knots = clamped_uniform_knots(n, self.degree)
+            self.uniform_knots.setflags(write=False)
+            self.uniform_knots_key = (n, self.degree)
+        return self.uniform_knots
+    
+    def basis(self, num_points):
+        knots = self.knots
+        return bspline_basis(len(self.points), self.degree, num_points,
+                             None if self.custom_knots is None else knots)
+    
+    def control_net(self):
+        """Coefficients the basis functions are applied to; rational subclasses use homogeneous points"""
+        return self.points
+    
+    def from_control_net(self, values):
+        return values
     
     def basis_function(self, i, p, t, knots):
-        if p == 0:
-            return 1.0 if (knots[i] <= t < knots[i + 1]) or (t == 1.0 and knots[i] <= t <= knots[i + 1]) else 0.0
-        
-        left_coeff = 0.0
-        right_coeff = 0.0
-        
-        if knots[i + p] - knots[i] != 0:
-            left_coeff = (t - knots[i]) / (knots[i + p] - knots[i]) * self.basis_function(i, p - 1, t, knots)
-        
-        if knots[i + p + 1] - knots[i + 1] != 0:
-            right_coeff = (knots[i + p + 1] - t) / (knots[i + p + 1] - knots[i + 1]) * self.basis_function(i + 1, p - 1, t, knots)
-        
-        return left_coeff + right_coeff
+        return kernels.basis_function(i, p, t, knots)
     
-    def evaluate_curve(self, num_points=300):
+    def update_samples(self, num_points=300):
         n = len(self.points)
         if n <= self.degree:
             return self.points
         
-        knots = self.generate_knots(n, self.degree)
-        
-        curve_points = []
-        t_values = np.linspace(0, 1, num_points)
+        indices, basis = self.basis(num_points)
+        net = self.control_net()
+
+        if self.incremental and self.samples is not None and len(self.samples) == num_points:
+            rows = self.dirty_sample_range(indices)
+            patch = self.from_control_net(kernels.apply_local_basis(indices[rows], basis[rows], net))
+            if np.isfinite(patch).all():
+                self.samples[rows] = patch
+                self.dirty_points.clear()
+                self.mark_dirty_rows(rows)
+                return self.samples
+
+        curve_points = self.from_control_net(kernels.apply_local_basis(indices, basis, net))
+        self.dirty_points.clear()
+
+        finite = np.isfinite(curve_points).all(axis=1)
+        if not finite.all():
+            self.samples = None
+            self.dirty_range = None
+            curve_points = curve_points[finite]
+            return curve_points if len(curve_points) else self.points
+
+        self.samples = curve_points if self.incremental else None
+        self.mark_dirty_rows(slice(0, num_points))
+        return curve_points
+    
+    def evaluate_at(self, t_values):
+        n = len(self.points)
+        if n <= self.degree:
+            return self.points
+        return self.from_control_net(kernels.bspline_evaluate(self.control_net(), self.knots, self.degree, t_values))
+    
+    def derivative(self, t_values, order=1):
+        """order-th derivative at t (scalar or array), evaluated on the derivative B-spline's control points"""
+        t_values = np.atleast_1d(np.asarray(t_values, dtype=float))
+        n = len(self.points)
+        if n <= self.degree:
+            return np.zeros((len(t_values), 2))
+        return bspline_derivative(self.points, self.knots, self.degree, t_values, order)
+    
+    def evaluate_rows(self, rows, num_points):
+        indices, basis = self.basis(num_points)
+        return self.from_control_net(kernels.apply_local_basis(indices[rows], basis[rows], self.control_net()))
+    
+    def is_degenerate(self):
+        return len(self.points) <= self.degree
+    
+    def visible_parameter_ranges(self, xlim, ylim):
+        """Knot spans whose degree + 1 control points have a bounding box inside the view"""
+        n = len(self.points)
+        knots = self.knots
+        windows = np.lib.stride_tricks.sliding_window_view(self.points, self.degree + 1, axis=0)
+        hit = boxes_intersect(windows.min(axis=2), windows.max(axis=2), xlim, ylim)
         
-        for t in t_values:
-            t = max(0, min(1, t))
-            
-            point = np.zeros(2)
-            for i in range(n):
-                basis = self.basis_function(i, self.degree, t, knots)
-                point += basis * self.points[i]
-                
-            if np.isfinite(point).all():
-                curve_points.append(point)
+        spans = np.arange(self.degree, n)[hit]
+        return merge_ranges(np.column_stack([knots[spans], knots[spans + 1]]))
+    
+    def to_bezier_segments(self):
+        """Bézier segments (k, degree + 1, d) of control_net() over the non-empty knot spans and their parameter ranges (k, 2)"""
+        net = self.control_net()
+        if len(net) <= self.degree:
+            return np.empty((0, self.degree + 1, net.shape[-1])), np.empty((0, 2))
         
-        return np.array(curve_points) if curve_points else self.points
+        key = (self.version, self.degree)
+        if self.segment_cache_key != key:
+            self.segment_cache = bspline_to_bezier(net, self.knots, self.degree)
+            self.segment_cache_key = key
+        return self.segment_cache
+    
+    def rational_bezier_segments(self):
+        segments, ranges = self.to_bezier_segments()
+        return homogenize(segments, np.ones(segments.shape[:-1])), ranges
+    
+    def insert_knot(self, t, times=1):
+        """Boehm knot insertion at t: adds control points without changing the curve"""
+        points, knots = insert_knot(self.points, self.knots, self.degree, t, times)
+        self.set_points(points)
+        self.custom_knots = knots
+        self.custom_knots.setflags(write=False)
+    
+    def initial_segments(self):
+        # Four samples per knot span
+        return 4 * max(len(self.points) - self.degree, 1)
+    
+    def dirty_sample_range(self, indices):
+        """Samples whose support contains a moved point: span - degree <= i <= span"""
+        if not self.dirty_points:
+            return slice(0, 0)
+
+        first = indices[:, 0]
+        lo = np.searchsorted(first, min(self.dirty_points) - self.degree, side='left')
+        hi = np.searchsorted(first, max(self.dirty_points), side='right')
+        return slice(lo, hi)
     
     def can_remove_point(self):
         return len(self.points) > self.degree + 1
\ No newline at end of file
@@ -2,8 +2,6 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
 from bezier_curve import BezierCurve
-import tkinter as tk
-from tkinter import simpledialog
 
 
 class ButtonManager:
@@ -72,6 +70,10 @@ class ButtonManager:
         if self.animator and self.animator.animation_active:
             return  # Nu permite adăugarea în timpul animației
 
+        # Tkinter is only needed once the coordinate dialog is opened
+        import tkinter as tk
+        from tkinter import simpledialog
+
         root = tk.Tk()
         root.withdraw()
 
@@ -88,8 +90,7 @@ class ButtonManager:
             y = float(y_input)
 
         
-            new_point = np.array([[x, y]])
-            self.curve.points = np.vstack([self.curve.points, new_point])
+            self.curve.add_point((x, y))
 
             # Reafișează curba
             self.renderer.render_curve(self.curve)
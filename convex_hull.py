@@ -0,0 +1,150 @@
+import numpy as np
+
+
+def cross(origin, a, b):
+    return (a[..., 0] - origin[..., 0]) * (b[..., 1] - origin[..., 1]) - \
+           (a[..., 1] - origin[..., 1]) * (b[..., 0] - origin[..., 0])
+
+
+def monotone_chain(points, indices):
+    """Counter-clockwise hull vertices (indices into points) of a small candidate set"""
+    order = sorted(set(indices), key=lambda i: (points[i][0], points[i][1]))
+    if len(order) < 3:
+        return order
+    
+    lower = []
+    for i in order:
+        while len(lower) >= 2 and cross(points[lower[-2]], points[lower[-1]], points[i]) <= 0:
+            lower.pop()
+        lower.append(i)
+    upper = []
+    for i in reversed(order):
+        while len(upper) >= 2 and cross(points[upper[-2]], points[upper[-1]], points[i]) <= 0:
+            upper.pop()
+        upper.append(i)
+    return lower[:-1] + upper[:-1]
+
+
+class HullTracker:
+    """Convex hull of a curve's control points, kept up to date as single points move.
+
+    A move that stays inside the hull and does not involve a hull vertex costs one O(h)
+    containment test; a point leaving the hull is inserted in O(h); a moved or removed hull
+    vertex is handled locally from the triangle it used to span. Only a wholesale change of
+    the points triggers a full SciPy rebuild.
+    """
+    
+    def __init__(self):
+        self.vertices = None
+        self.degenerate = False
+        self.valid = False
+        self.full_builds = 0
+        self.skipped = 0
+        self.incremental = 0
+        self.local = 0
+    
+    def invalidate(self):
+        self.valid = False
+    
+    def rebuild(self, points):
+        # SciPy is only loaded the first time a hull is actually shown
+        from scipy.spatial import ConvexHull, QhullError
+        
+        self.full_builds += 1
+        self.valid = True
+        try:
+            self.vertices = np.asarray(ConvexHull(points).vertices)
+            self.degenerate = False
+        except (QhullError, ValueError):
+            # Collinear or coincident points have no 2D hull
+            self.vertices = None
+            self.degenerate = True
+    
+    def hull_points(self, points):
+        if not self.valid:
+            self.rebuild(points)
+        if self.degenerate:
+            return points
+        
+        hull_points = points[self.vertices]
+        return np.vstack([hull_points, hull_points[0]])
+    
+    def contains(self, points, point):
+        polygon = points[self.vertices]
+        return bool((cross(polygon, np.roll(polygon, -1, axis=0), point) >= 0).all())
+    
+    def insert(self, points, index):
+        """Add an outside point: drop the chain of vertices it can see and link it to both ends"""
+        polygon = points[self.vertices]
+        visible = cross(polygon, np.roll(polygon, -1, axis=0), points[index]) < 0
+        last = np.nonzero(visible & ~np.roll(visible, -1))[0][0]
+        kept = len(self.vertices) - visible.sum() + 1
+        self.vertices = np.append(np.roll(self.vertices, -(last + 1))[:kept], index)
+    
+    def rebuild_locally(self, points, position, old_point, extra=()):
+        """Hull vertex at position moved away or was removed: only points of its old corner triangle can surface"""
+        count = len(self.vertices)
+        previous = points[self.vertices[position - 1]]
+        following = points[self.vertices[(position + 1) % count]]
+        
+        corner = (cross(previous, old_point, points) >= 0) & (cross(old_point, following, points) >= 0) & \
+                 (cross(following, previous, points) >= 0)
+        candidates = np.concatenate([np.delete(self.vertices, position), np.nonzero(corner)[0], extra])
+        
+        vertices = monotone_chain(points, candidates.astype(int).tolist())
+        if len(vertices) < 3:
+            self.invalidate()
+            return
+        self.vertices = np.asarray(vertices)
+    
+    def point_moved(self, points, index, old_point):
+        if not self.valid:
+            return
+        if self.degenerate:
+            self.invalidate()
+            return
+        
+        position = np.nonzero(self.vertices == index)[0]
+        if len(position):
+            self.local += 1
+            self.rebuild_locally(points, position[0], old_point, extra=[index])
+        elif self.contains(points, points[index]):
+            self.skipped += 1
+        else:
+            self.incremental += 1
+            self.insert(points, index)
+    
+    def point_added(self, points, index):
+        if not self.valid:
+            return
+        if self.degenerate:
+            self.invalidate()
+        elif self.contains(points, points[index]):
+            self.skipped += 1
+        else:
+            self.incremental += 1
+            self.insert(points, index)
+    
+    def point_removed(self, points, index, old_point):
+        if not self.valid:
+            return
+        if self.degenerate:
+            self.invalidate()
+            return
+        
+        position = np.nonzero(self.vertices == index)[0]
+        if len(position):
+            self.local += 1
+            self.rebuild_locally(points, position[0], old_point)
+        else:
+            self.skipped += 1
+    
+    def stats(self):
+        updates = self.skipped + self.incremental + self.local
+        return {
+            'full_builds': self.full_builds,
+            'skipped': self.skipped,
+            'incremental': self.incremental,
+            'local': self.local,
+            'skip_rate': self.skipped / updates if updates else 0.0
+        }
@@ -1,53 +1,323 @@
 import numpy as np
-from scipy.spatial import ConvexHull
 from abc import ABC, abstractmethod
+from convex_hull import HullTracker
+from curve_kernels import polyline_with_breaks, signed_curvature, arc_length_table, lengths_to_parameters, gauss_points
+from spatial_index import PointGrid
 
 
 class CurveBase(ABC):
     
-    def __init__(self, initial_points, color='#45B7D1'):
-        self.points = np.array(initial_points, dtype=float)
+    def __init__(self, initial_points, color='#45B7D1', copy=True):
+        self.version = 0
+        self.incremental = True
+        self.samples = None
+        self.dirty_points = set()
+        self.dirty_range = None
+        self.spatial_index = None
+        self.index_threshold = 64
+        self.picked_t = None
+        self.hull = HullTracker()
+        self.arc_length_intervals = 256
+        self.arc_table = None
+        self.arc_table_key = None
+
+        self.set_points(initial_points, copy)
         self.color = color
         self.show_hull = False
         self.dragging = -1
         
         self.curve_line = None
+        self.curve_line_samples = None
         self.control_line = None
-        self.points_patches = []
+        self.points_collection = None
         self.hull_line = None
+        self.pick_line = None
+    
+    @property
+    def points(self):
+        return self._points
+    
+    @points.setter
+    def points(self, value):
+        self.set_points(value)
+    
+    def set_points(self, value, copy=True):
+        # copy=False keeps a floating-point array as is, e.g. a zero-copy view into a memory map
+        if copy or not np.issubdtype(np.asarray(value).dtype, np.floating):
+            self._points = np.array(value, dtype=float)
+        else:
+            self._points = np.asarray(value)
+        self.invalidate()
+    
+    def invalidate(self):
+        self.spatial_index = None
+        self.hull.invalidate()
+        self.reset_samples()
+    
+    def reset_samples(self):
+        # The point count changed: the sample buffer can no longer be patched
+        self.version += 1
+        self.samples = None
+        self.dirty_points.clear()
+        self.dirty_range = None
     
     @abstractmethod
-    def evaluate_curve(self, num_points=200):
+    def update_samples(self, num_points):
+        """Bring the sample buffer up to date and return it without copying.
+
+        Later evaluations patch the buffer in place; the rows they touch accumulate in
+        dirty_range until take_dirty_range(). Curves that cannot be buffered (too few points,
+        non-finite samples, incremental off) return a fresh array instead.
+        """
         pass
     
-    def compute_convex_hull(self):
-        if len(self.points) < 3:
+    def evaluate_curve(self, num_points=None):
+        """num_points samples as an array the caller owns"""
+        samples = self.update_samples(num_points or self.num_samples)
+        return samples.copy() if samples is self.samples else samples
+    
+    def mark_dirty_rows(self, rows):
+        if rows.stop <= rows.start:
+            return
+        if self.dirty_range is None:
+            self.dirty_range = rows
+        else:
+            self.dirty_range = slice(min(self.dirty_range.start, rows.start), max(self.dirty_range.stop, rows.stop))
+    
+    def take_dirty_range(self):
+        """Sample rows changed since the last call (a slice), or None"""
+        rows, self.dirty_range = self.dirty_range, None
+        return rows
+    
+    @abstractmethod
+    def evaluate_at(self, t_values):
+        pass
+    
+    @abstractmethod
+    def derivative(self, t_values, order=1):
+        pass
+    
+    @abstractmethod
+    def rational_bezier_segments(self):
+        """Bézier segments in homogeneous coordinates (k, n, 3) and the parameter range (k, 2) each one covers"""
+        pass
+    
+    @abstractmethod
+    def evaluate_rows(self, rows, num_points):
+        pass
+    
+    @abstractmethod
+    def visible_parameter_ranges(self, xlim, ylim):
+        pass
+    
+    def is_degenerate(self):
+        return len(self.points) < 2
+    
+    def visible_point_mask(self, xlim, ylim):
+        x, y = self.points[:, 0], self.points[:, 1]
+        return (x >= xlim[0]) & (x <= xlim[1]) & (y >= ylim[0]) & (y <= ylim[1])
+    
+    def evaluate_ranges(self, ranges, num_points=None):
+        """Samples of the regular grid that fall inside the parameter ranges, NaN-separated"""
+        num_points = num_points or self.num_samples
+        if self.is_degenerate():
             return self.points
+        if len(ranges) == 0:
+            return np.empty((0, 2))
         
-        try:
-            hull = ConvexHull(self.points)
-            hull_points = self.points[hull.vertices]
-            hull_points = np.vstack([hull_points, hull_points[0]])
-            return hull_points
-        except:
+        t_values = np.linspace(0, 1, num_points)
+        slot = np.searchsorted(ranges[:, 0], t_values, side='right') - 1
+        inside = (slot >= 0) & (t_values <= ranges[np.maximum(slot, 0), 1])
+        
+        # One extra sample on each side so the polyline reaches the view edge
+        covered = inside.copy()
+        covered[1:] |= inside[:-1]
+        covered[:-1] |= inside[1:]
+        
+        rows = np.nonzero(covered)[0]
+        return polyline_with_breaks(self.evaluate_rows(rows, num_points), rows)
+    
+    def initial_segments(self):
+        return 4 * max(len(self.points) - 1, 1)
+    
+    def evaluate_adaptive(self, tolerance, ranges=None, max_depth=12):
+        """Minimal polyline whose chord error stays below tolerance (in data units)"""
+        if self.is_degenerate():
+            return self.points
+        if ranges is None:
+            ranges = np.array([[0.0, 1.0]])
+        
+        pieces = []
+        for start, end in ranges:
+            segments = max(2, int(np.ceil(self.initial_segments() * (end - start))))
+            if pieces:
+                pieces.append(np.full((1, 2), np.nan))
+            pieces.append(self.subdivide(np.linspace(start, end, segments + 1), tolerance, max_depth))
+        
+        return np.concatenate(pieces) if pieces else np.empty((0, 2))
+    
+    def subdivide(self, t_values, tolerance, max_depth):
+        curve_points = self.evaluate_at(t_values)
+        active = np.ones(len(t_values) - 1, dtype=bool)
+        
+        for _ in range(max_depth):
+            segments = np.nonzero(active)[0]
+            if len(segments) == 0:
+                break
+            
+            t_mid = 0.5 * (t_values[segments] + t_values[segments + 1])
+            mid_points = self.evaluate_at(t_mid)
+            
+            start = curve_points[segments]
+            chord = curve_points[segments + 1] - start
+            offset = mid_points - start
+            length = np.hypot(chord[:, 0], chord[:, 1])
+            cross = np.abs(chord[:, 0] * offset[:, 1] - chord[:, 1] * offset[:, 0])
+            error = np.where(length > 0, cross / np.where(length > 0, length, 1.0),
+                             np.hypot(offset[:, 0], offset[:, 1]))
+            
+            split = error > tolerance
+            refine = np.zeros(len(active), dtype=bool)
+            refine[segments[split]] = True
+            
+            # A split interval becomes two active halves; intervals that passed are final
+            insert_at = segments[split] + 1
+            t_values = np.insert(t_values, insert_at, t_mid[split])
+            curve_points = np.insert(curve_points, insert_at, mid_points[split], axis=0)
+            active = np.insert(refine, insert_at, True)
+        
+        return curve_points
+    
+    def compute_convex_hull(self):
+        if len(self.points) < 3:
             return self.points
+        return self.hull.hull_points(self.points)
     
-    def add_point(self):
-        new_point = np.array([[np.random.uniform(0.5, 5.5), np.random.uniform(0.5, 4.5)]])
-        self.points = np.vstack([self.points, new_point])
+    def add_point(self, point=None):
+        if point is None:
+            point = (np.random.uniform(0.5, 5.5), np.random.uniform(0.5, 4.5))
+        self._points = np.vstack([self._points, np.asarray(point, dtype=float).reshape(1, 2)])
+        self.reset_samples()
+        if self.spatial_index is not None:
+            self.spatial_index.append(self._points[-1])
+        self.track_hull(self.hull.point_added, len(self._points) - 1)
     
     def remove_point(self):
         if self.can_remove_point():
-            self.points = self.points[:-1]
+            removed = self._points[-1].copy()
+            self._points = self._points[:-1]
+            self.reset_samples()
+            if self.spatial_index is not None:
+                self.spatial_index.remove_last()
+            self.track_hull(self.hull.point_removed, len(self._points), removed)
     
     def can_remove_point(self):
         return len(self.points) > 2
     
     def get_closest_point_index(self, x, y, threshold=0.2):
-        distances = np.sqrt((self.points[:, 0] - x)**2 + (self.points[:, 1] - y)**2)
-        closest_idx = np.argmin(distances)
-        return closest_idx if distances[closest_idx] < threshold else -1
+        if len(self.points) < self.index_threshold:
+            distances = np.sqrt((self.points[:, 0] - x)**2 + (self.points[:, 1] - y)**2)
+            closest_idx = np.argmin(distances)
+            return closest_idx if distances[closest_idx] < threshold else -1
+        
+        if self.spatial_index is None:
+            self.spatial_index = PointGrid(self.points, threshold)
+        return self.spatial_index.nearest(self.points, x, y, threshold)
     
     def update_point(self, index, x, y):
         if 0 <= index < len(self.points):
-            self.points[index] = [x, y]
\ No newline at end of file
+            old_point = self.points[index].copy()
+            self.points[index] = [x, y]
+            self.version += 1
+            self.dirty_points.add(index)
+            if self.spatial_index is not None:
+                self.spatial_index.move(index, self.points[index])
+            self.track_hull(self.hull.point_moved, index, old_point)
+    
+    def track_hull(self, update, *args):
+        # Keeping the hull current only pays off while it is displayed
+        if self.show_hull and len(self.points) >= 3:
+            update(self.points, *args)
+        else:
+            self.hull.invalidate()
+    
+    def derivatives_at(self, t_values):
+        """Position and first derivative at t (scalar or array); both have one row per parameter"""
+        t_values = np.atleast_1d(np.asarray(t_values, dtype=float))
+        return self.evaluate_at(t_values), self.derivative(t_values)
+    
+    def curvature(self, t_values):
+        """Signed curvature at t, scalar or array (positive where the curve turns counter-clockwise)"""
+        t_values = np.atleast_1d(np.asarray(t_values, dtype=float))
+        return signed_curvature(self.derivative(t_values), self.derivative(t_values, 2))
+    
+    def arc_length_table(self):
+        """Cumulative arc length at uniform parameters, cached until the points change"""
+        key = (self.version, self.arc_length_intervals)
+        if self.arc_table_key != key:
+            self.arc_table = arc_length_table(self.derivative, self.arc_length_intervals)
+            self.arc_table_key = key
+        return self.arc_table
+    
+    def length(self):
+        return float(self.arc_length_table()[1][-1])
+    
+    def parameters_at_lengths(self, lengths, iterations=2):
+        """Parameters t where the arc length from t = 0 equals lengths"""
+        t_grid, s_grid = self.arc_length_table()
+        lengths = np.clip(np.asarray(lengths, dtype=float), 0, s_grid[-1])
+        t = lengths_to_parameters(t_grid, s_grid, lengths)
+        
+        # Newton on s(t) - length, with s(t) integrated exactly from the preceding table entry
+        for _ in range(iterations):
+            k = np.clip(np.searchsorted(t_grid, t, side='right') - 1, 0, len(t_grid) - 2)
+            nodes, weights = gauss_points(t_grid[k], t)
+            speed = np.hypot(*self.derivative(nodes.ravel()).T).reshape(nodes.shape)
+            s = s_grid[k] + (speed * weights).sum(axis=1)
+            velocity = np.hypot(*self.derivative(t).T)
+            t = np.clip(t - np.divide(s - lengths, velocity, out=np.zeros_like(t), where=velocity > 0), 0, 1)
+        return t
+    
+    def constant_speed_parameters(self, count, endpoint=True):
+        """count parameters spaced evenly along the curve by arc length"""
+        return self.parameters_at_lengths(np.linspace(0, self.length(), count, endpoint=endpoint))
+    
+    def project_point(self, x, y, num_points=None, iterations=8):
+        """Closest point on the curve to (x, y): (t, point, distance)
+
+        Seeded from the nearest sample of the cached buffer, refined with Newton's method
+        on f(t) = (C(t) - q) . C'(t) = 0 using the analytic first and second derivatives.
+        """
+        num_points = num_points or self.num_samples
+        query = np.array([x, y], dtype=float)
+        samples = self.samples
+        if samples is None or len(samples) != num_points:
+            samples = self.evaluate_at(np.linspace(0, 1, num_points))
+        
+        offsets = samples - query
+        t = np.argmin(np.einsum('ij,ij->i', offsets, offsets)) / (num_points - 1)
+        
+        for _ in range(iterations):
+            offset = self.evaluate_at([t])[0] - query
+            first = self.derivative([t])[0]
+            second = self.derivative([t], 2)[0]
+            slope = first @ first + offset @ second
+            if slope <= 0:
+                # Not a minimum along this direction: fall back to a Gauss-Newton step
+                slope = first @ first
+            if slope == 0:
+                break
+            t_next = min(max(t - (offset @ first) / slope, 0.0), 1.0)
+            if abs(t_next - t) < 1e-12:
+                break
+            t = t_next
+        
+        point = self.evaluate_at([t])[0]
+        return float(t), point, float(np.hypot(*(point - query)))
+    
+    def pick_curve(self, x, y, threshold=0.2):
+        """Parameter t of the curve point under (x, y), or None"""
+        if self.is_degenerate():
+            return None
+        t, _, distance = self.project_point(x, y)
+        return t if distance < threshold else None
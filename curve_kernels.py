@@ -0,0 +1,364 @@
+from math import comb
+import numpy as np
+
+
+def de_casteljau_batch(points, t_values):
+    """Vectorized De Casteljau: points (..., n, d), t_values (m,) -> (..., m, d)"""
+    points = np.asarray(points, dtype=float)
+    t = np.asarray(t_values, dtype=float).reshape(-1, 1, 1)
+    s = 1.0 - t
+    n = points.shape[-2]
+
+    work = np.repeat(points[..., np.newaxis, :, :], len(t), axis=-3)
+    for r in range(1, n):
+        work[..., :n - r, :] = s * work[..., :n - r, :] + t * work[..., 1:n - r + 1, :]
+
+    return work[..., 0, :]
+
+
+def de_casteljau_each(points, t):
+    """One parameter per curve: points (k, n, d), t (k,) -> (k, d)"""
+    work = np.array(points, dtype=float)
+    t = np.asarray(t, dtype=float)[:, np.newaxis, np.newaxis]
+    n = work.shape[-2]
+    for r in range(1, n):
+        work[:, :n - r] = (1 - t) * work[:, :n - r] + t * work[:, 1:n - r + 1]
+    return work[:, 0]
+
+
+def de_casteljau_levels_batch(points, t_values):
+    """Every De Casteljau level for every t: (m, n, n, d), level r holds n - r points and NaN padding"""
+    points = np.asarray(points, dtype=float)
+    t = np.asarray(t_values, dtype=float).reshape(-1, 1, 1)
+    s = 1.0 - t
+    n, d = points.shape
+
+    levels = np.full((len(t), n, n, d), np.nan)
+    levels[:, 0] = points
+    for r in range(1, n):
+        levels[:, r, :n - r] = s * levels[:, r - 1, :n - r] + t * levels[:, r - 1, 1:n - r + 1]
+
+    return levels
+
+
+def split_bezier(points, t=0.5):
+    """Split stacked Bezier control polygons (..., n, d) at t (scalar or one per curve) into left and right halves"""
+    points = np.asarray(points, dtype=float)
+    t = np.asarray(t, dtype=float)[..., np.newaxis, np.newaxis]
+    n = points.shape[-2]
+    left = np.empty_like(points)
+    right = np.empty_like(points)
+
+    work = points.copy()
+    left[..., 0, :] = work[..., 0, :]
+    right[..., n - 1, :] = work[..., n - 1, :]
+    for r in range(1, n):
+        work[..., :n - r, :] = (1 - t) * work[..., :n - r, :] + t * work[..., 1:n - r + 1, :]
+        left[..., r, :] = work[..., 0, :]
+        right[..., n - 1 - r, :] = work[..., n - r - 1, :]
+
+    return left, right
+
+
+def bezier_hodograph(points, order=1):
+    """Control points (..., n - order, d) of the order-th derivative curve"""
+    points = np.asarray(points, dtype=float)
+    for _ in range(order):
+        n = points.shape[-2]
+        points = (n - 1) * np.diff(points, axis=-2)
+    return points
+
+
+def bezier_derivative(points, t_values, order=1):
+    """order-th derivative of stacked Bezier curves: points (..., n, d), t_values (m,) -> (..., m, d)"""
+    points = np.asarray(points, dtype=float)
+    if points.shape[-2] <= order:
+        return np.zeros(points.shape[:-2] + (len(np.atleast_1d(t_values)), points.shape[-1]))
+    hodograph = bezier_hodograph(points, order)
+    return bernstein_matrix(hodograph.shape[-2], np.atleast_1d(t_values)) @ hodograph
+
+
+def bernstein_matrix(n, t_values):
+    """Bernstein basis matrix (m, n), built with the De Casteljau recurrence"""
+    t = np.asarray(t_values, dtype=float)
+    s = 1.0 - t
+    basis = np.zeros((len(t), n))
+    basis[:, 0] = 1.0
+
+    for r in range(1, n):
+        basis[:, r] = t * basis[:, r - 1]
+        basis[:, 1:r] = s[:, np.newaxis] * basis[:, 1:r] + t[:, np.newaxis] * basis[:, 0:r - 1]
+        basis[:, 0] = s * basis[:, 0]
+
+    return basis
+
+
+def clamped_uniform_knots(n, p):
+    if n <= p:
+        return np.array([0.0] * (p + 1) + [1.0] * (p + 1))
+
+    interior = np.arange(1, n - p) / (n - p)
+    return np.concatenate([np.zeros(p + 1), interior, np.ones(p + 1)])
+
+
+def basis_function(i, p, t, knots):
+    """Cox-de Boor recursion for the single basis function N(i, p) at t"""
+    if p == 0:
+        return 1.0 if (knots[i] <= t < knots[i + 1]) or (t == 1.0 and knots[i] <= t <= knots[i + 1]) else 0.0
+    
+    left_coeff = 0.0
+    right_coeff = 0.0
+    
+    if knots[i + p] - knots[i] != 0:
+        left_coeff = (t - knots[i]) / (knots[i + p] - knots[i]) * basis_function(i, p - 1, t, knots)
+    
+    if knots[i + p + 1] - knots[i + 1] != 0:
+        right_coeff = (knots[i + p + 1] - t) / (knots[i + p + 1] - knots[i + 1]) * basis_function(i + 1, p - 1, t, knots)
+    
+    return left_coeff + right_coeff
+
+
+def find_knot_spans(knots, degree, n, t_values):
+    """Knot span index of every t, clamped to [degree, n - 1] so that t == 1.0 falls in the last span"""
+    spans = np.searchsorted(knots, np.atleast_1d(np.asarray(t_values, dtype=float)), side='right') - 1
+    return np.clip(spans, degree, n - 1)
+
+
+def validate_knots(knots, n, degree):
+    """Knot vector as a float array; raises ValueError unless it fits n control points of this degree"""
+    knots = np.asarray(knots, dtype=float)
+    if knots.ndim != 1 or len(knots) != n + degree + 1:
+        raise ValueError(f"Expected {n + degree + 1} knots for {n} control points of degree {degree}, got {knots.size}")
+    if not np.isfinite(knots).all() or np.any(np.diff(knots) < 0):
+        raise ValueError("Knots must be finite and non-decreasing")
+    if knots[n] <= knots[degree]:
+        raise ValueError("The knot vector has an empty parameter domain")
+    # A degree 0 spline still needs distinct interior knots, so allow at least multiplicity 1
+    limit = max(degree, 1)
+    _, multiplicity = np.unique(knots[degree + 1:n], return_counts=True)
+    if multiplicity.size and multiplicity.max() > limit:
+        raise ValueError(f"Interior knots may repeat at most {limit} times")
+    return knots
+
+
+def insert_knot(points, knots, degree, u, times=1):
+    """Boehm knot insertion: points (..., n, d) -> (..., n + times, d) describing the same curve"""
+    points = np.asarray(points, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    for _ in range(times):
+        n = points.shape[-2]
+        k = int(find_knot_spans(knots, degree, n, [u])[0])
+        i = np.arange(k - degree + 1, k + 1)
+        alpha = ((u - knots[i]) / (knots[i + degree] - knots[i]))[:, np.newaxis]
+        blended = alpha * points[..., i, :] + (1 - alpha) * points[..., i - 1, :]
+        points = np.concatenate([points[..., :k - degree + 1, :], blended, points[..., k:, :]], axis=-2)
+        knots = np.insert(knots, k + 1, u)
+    return points, knots
+
+
+def bspline_to_bezier(points, knots, degree):
+    """Bézier segments (..., k, degree + 1, d) of the non-empty spans and their knot ranges (k, 2).
+
+    Every knot in the parameter domain is raised to multiplicity degree with Boehm insertion;
+    the control points of each span are then exactly its Bézier control points.
+    """
+    points = np.asarray(points, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    n = points.shape[-2]
+    start, end = knots[degree], knots[n]
+
+    values, counts = np.unique(knots[(knots >= start) & (knots <= end)], return_counts=True)
+    for value, count in zip(values, counts):
+        if count < degree:
+            points, knots = insert_knot(points, knots, degree, value, degree - count)
+
+    n = points.shape[-2]
+    spans = np.arange(degree, n)
+    spans = spans[knots[spans + 1] > knots[spans]]
+    rows = spans[:, np.newaxis] - degree + np.arange(degree + 1)
+    return points[..., rows, :], np.column_stack([knots[spans], knots[spans + 1]])
+
+
+def bspline_basis_local(knots, degree, spans, t_values):
+    """Non-zero basis functions N[span - degree .. span] for every sample (m, degree + 1)"""
+    knots = np.asarray(knots, dtype=float)
+    t = np.atleast_1d(np.asarray(t_values, dtype=float))
+    m = len(t)
+
+    basis = np.zeros((m, degree + 1))
+    basis[:, 0] = 1.0
+    left = np.empty((m, degree + 1))
+    right = np.empty((m, degree + 1))
+
+    for j in range(1, degree + 1):
+        left[:, j] = t - knots[spans + 1 - j]
+        right[:, j] = knots[spans + j] - t
+        saved = np.zeros(m)
+        for r in range(j):
+            temp = basis[:, r] / (right[:, r + 1] + left[:, j - r])
+            basis[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        basis[:, j] = saved
+
+    return basis
+
+
+def bspline_basis_indexed(knots, degree, n, t_values):
+    """Control point indices (m, degree + 1) and matching non-zero basis values for every sample"""
+    t = np.atleast_1d(np.asarray(t_values, dtype=float))
+    spans = find_knot_spans(knots, degree, n, t)
+    basis = bspline_basis_local(knots, degree, spans, t)
+    indices = spans[:, np.newaxis] - degree + np.arange(degree + 1)
+    return indices, basis
+
+
+def apply_local_basis(indices, basis, points):
+    """Sparse basis product: points (..., n, d) -> (..., m, d)"""
+    return np.einsum('mj,...mjd->...md', basis, points[..., indices, :])
+
+
+def bspline_evaluate(points, knots, degree, t_values):
+    """Span-local B-spline evaluation: points (..., n, d), t_values (m,) -> (..., m, d)"""
+    points = np.asarray(points, dtype=float)
+    indices, basis = bspline_basis_indexed(knots, degree, points.shape[-2], t_values)
+    return apply_local_basis(indices, basis, points)
+
+
+def bspline_hodograph(points, knots, degree):
+    """Control points, knots and degree of the derivative B-spline"""
+    points = np.asarray(points, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    n = points.shape[-2]
+    width = knots[degree + 1:degree + n] - knots[1:n]
+    scale = np.divide(degree, width, out=np.zeros_like(width), where=width > 0)
+    return scale[:, np.newaxis] * np.diff(points, axis=-2), knots[1:-1], degree - 1
+
+
+def bspline_derivative(points, knots, degree, t_values, order=1):
+    """order-th derivative of stacked B-splines: points (..., n, d), t_values (m,) -> (..., m, d)"""
+    points = np.asarray(points, dtype=float)
+    if order > degree:
+        return np.zeros(points.shape[:-2] + (len(np.atleast_1d(t_values)), points.shape[-1]))
+    for _ in range(order):
+        points, knots, degree = bspline_hodograph(points, knots, degree)
+    return bspline_evaluate(points, knots, degree, t_values)
+
+
+def homogenize(points, weights):
+    """Weighted control points in homogeneous coordinates: (..., n, d), (..., n) -> (..., n, d + 1)"""
+    points = np.asarray(points, dtype=float)
+    weights = np.asarray(weights, dtype=float)[..., np.newaxis]
+    return np.concatenate([points * weights, weights], axis=-1)
+
+
+def dehomogenize(values):
+    return values[..., :-1] / values[..., -1:]
+
+
+def rational_evaluate(points, weights, knots, degree, t_values):
+    """NURBS evaluation through the B-spline kernel in homogeneous coordinates: (..., n, d) -> (..., m, d)"""
+    return dehomogenize(bspline_evaluate(homogenize(points, weights), knots, degree, t_values))
+
+
+def rational_derivative(points, weights, knots, degree, t_values, order=1):
+    """order-th NURBS derivative from the homogeneous derivatives A(k) and w(k):
+    C(k) = (A(k) - sum_i binom(k, i) w(i) C(k - i)) / w
+    """
+    net = homogenize(points, weights)
+    derivatives = [bspline_evaluate(net, knots, degree, t_values)] + \
+                  [bspline_derivative(net, knots, degree, t_values, k) for k in range(1, order + 1)]
+    weight = [d[..., -1:] for d in derivatives]
+    curve = [derivatives[0][..., :-1] / weight[0]]
+    for k in range(1, order + 1):
+        value = derivatives[k][..., :-1].copy()
+        for i in range(1, k + 1):
+            value -= comb(k, i) * weight[i] * curve[k - i]
+        curve.append(value / weight[0])
+    return curve[order]
+
+
+def signed_curvature(first, second):
+    """Signed curvature of planar curves from first and second derivatives (..., 2)"""
+    cross = first[..., 0] * second[..., 1] - first[..., 1] * second[..., 0]
+    speed = np.hypot(first[..., 0], first[..., 1])
+    return np.divide(cross, speed ** 3, out=np.zeros_like(cross), where=speed > 0)
+
+
+GAUSS_NODES, GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(5)
+
+
+def gauss_points(t_start, t_end):
+    """5-point Gauss-Legendre nodes (k, 5) and weights (k, 5) over the intervals [t_start, t_end]"""
+    half = 0.5 * (np.asarray(t_end) - np.asarray(t_start))[..., np.newaxis]
+    middle = 0.5 * (np.asarray(t_end) + np.asarray(t_start))[..., np.newaxis]
+    return middle + half * GAUSS_NODES, half * GAUSS_WEIGHTS
+
+
+def arc_length_table(derivative, num_intervals=256):
+    """Cumulative arc length s (..., g) at the uniform parameters t (g,) of stacked curves.
+
+    derivative maps parameters (m,) to first derivatives (..., m, d); every interval is
+    integrated with 5-point Gauss-Legendre.
+    """
+    t = np.linspace(0, 1, num_intervals + 1)
+    nodes, weights = gauss_points(t[:-1], t[1:])
+    tangents = derivative(nodes.ravel())
+    speed = np.hypot(tangents[..., 0], tangents[..., 1]).reshape(tangents.shape[:-2] + nodes.shape)
+    pieces = (speed * weights).sum(axis=-1)
+    s = np.zeros(pieces.shape[:-1] + (num_intervals + 1,))
+    np.cumsum(pieces, axis=-1, out=s[..., 1:])
+    return t, s
+
+
+def lengths_to_parameters(t, s, lengths):
+    """Invert stacked arc-length tables: s (..., g), lengths (..., q) -> parameters (..., q), linear in each interval"""
+    s = np.asarray(s, dtype=float)
+    lengths = np.broadcast_to(np.asarray(lengths, dtype=float), s.shape[:-1] + np.shape(lengths)[-1:])
+    total = s[..., -1:]
+    lengths = np.clip(lengths, 0, total)
+
+    # One searchsorted for every curve: shift each row past the end of the previous one
+    rows = s.reshape(-1, s.shape[-1])
+    shift = np.cumsum(np.concatenate([[0.0], rows[:-1, -1] + 1.0]))[:, np.newaxis]
+    flat_s = (rows + shift).ravel()
+    queries = lengths.reshape(len(rows), -1) + shift
+    k = np.searchsorted(flat_s, queries, side='right') - 1
+    k = np.clip(k - np.arange(len(rows))[:, np.newaxis] * rows.shape[1], 0, rows.shape[1] - 2)
+
+    row = np.arange(len(rows))[:, np.newaxis]
+    s0, s1 = rows[row, k], rows[row, k + 1]
+    fraction = np.divide(queries - shift - s0, s1 - s0, out=np.zeros_like(s0), where=s1 > s0)
+    return (t[k] + fraction * (t[k + 1] - t[k])).reshape(lengths.shape)
+
+
+def boxes_intersect(lower, upper, xlim, ylim):
+    """Which axis-aligned boxes (k, 2) overlap the view rectangle"""
+    return ((upper[:, 0] >= xlim[0]) & (lower[:, 0] <= xlim[1]) &
+            (upper[:, 1] >= ylim[0]) & (lower[:, 1] <= ylim[1]))
+
+
+def boxes_inside(lower, upper, xlim, ylim):
+    """Which axis-aligned boxes (k, 2) lie entirely inside the view rectangle"""
+    return ((lower[:, 0] >= xlim[0]) & (upper[:, 0] <= xlim[1]) &
+            (lower[:, 1] >= ylim[0]) & (upper[:, 1] <= ylim[1]))
+
+
+def merge_ranges(ranges):
+    """Merge touching or overlapping parameter intervals (k, 2)"""
+    if len(ranges) == 0:
+        return np.empty((0, 2))
+
+    ranges = ranges[np.argsort(ranges[:, 0], kind='stable')]
+    reach = np.maximum.accumulate(ranges[:, 1])
+    starts = np.concatenate([[True], ranges[1:, 0] > reach[:-1]])
+    first = np.nonzero(starts)[0]
+    return np.column_stack([ranges[first, 0], np.maximum.reduceat(ranges[:, 1], first)])
+
+
+def polyline_with_breaks(samples, rows):
+    """Samples taken at sorted rows of a grid, with NaN rows wherever the rows are not adjacent"""
+    if len(rows) == 0:
+        return np.empty((0, 2))
+
+    gaps = np.nonzero(np.diff(rows) > 1)[0] + 1
+    return np.insert(samples, gaps, np.nan, axis=0)
@@ -1,12 +1,20 @@
-import matplotlib.patches as patches
+import numpy as np
+from matplotlib.collections import EllipseCollection
 from bezier_curve import BezierCurve
+from curve_kernels import polyline_with_breaks
+from frame_profiler import profiler
 
 
 class CurveRenderer:
     
-    def __init__(self, ax, title):
+    def __init__(self, ax, title, blit_manager=None):
         self.ax = ax
         self.title = title
+        self.blit_manager = blit_manager
+        self.point_radius = 0.1
+        self.adaptive = False
+        self.pixel_tolerance = 0.25
+        self.culling = False
         self.setup_axes()
     
     def setup_axes(self):
@@ -16,57 +24,181 @@ class CurveRenderer:
         self.ax.grid(True, alpha=0.3)
         self.ax.set_aspect('equal')
     
-    def render_curve(self, curve):
-        self.clear_curve(curve)
-        
+    def create_artists(self, curve):
         curve.control_line, = self.ax.plot(
-            curve.points[:, 0], curve.points[:, 1], 
-            'o--', color='gray', alpha=0.5, linewidth=1, markersize=4
+            [], [], 'o--', color='gray', alpha=0.5, linewidth=1, markersize=4
+        )
+        curve.curve_line, = self.ax.plot([], [], color=curve.color, linewidth=3)
+        curve.hull_line, = self.ax.plot(
+            [], [], '--', color='red', linewidth=2, alpha=0.7,
+            label='Convex Hull'
         )
+        curve.hull_line.set_visible(False)
+        curve.pick_line, = self.ax.plot([], [], 'X', color='black', markersize=10, zorder=11)
         
-        if len(curve.points) >= 2:
-            curve_points = curve.evaluate_curve()
-            if len(curve_points) > 1:
-                curve.curve_line, = self.ax.plot(
-                    curve_points[:, 0], curve_points[:, 1], 
-                    color=curve.color, linewidth=3
-                )
-                
-        if curve.show_hull and len(curve.points) >= 3:
-            hull_points = curve.compute_convex_hull()
-            if len(hull_points) > 2:
-                curve.hull_line, = self.ax.plot(
-                    hull_points[:, 0], hull_points[:, 1], 
-                    '--', color='red', linewidth=2, alpha=0.7, 
-                    label='Convex Hull'
-                )
+        if self.blit_manager is not None:
+            for line in [curve.control_line, curve.curve_line, curve.hull_line, curve.pick_line]:
+                self.blit_manager.add_artist(line)
+    
+    def redraw(self):
+        with profiler.stage('render.redraw'):
+            if self.blit_manager is not None:
+                self.blit_manager.update()
+            else:
+                self.ax.figure.canvas.draw_idle()
+    
+    def data_tolerance(self):
+        """Chord tolerance in data units matching pixel_tolerance at the current view limits"""
+        xlim = self.ax.get_xlim()
+        ylim = self.ax.get_ylim()
+        bbox = self.ax.bbox
+        units_per_pixel = min(abs(xlim[1] - xlim[0]) / max(bbox.width, 1),
+                              abs(ylim[1] - ylim[0]) / max(bbox.height, 1))
+        return self.pixel_tolerance * units_per_pixel
+    
+    def view_limits(self, margin=0.0):
+        xlim = sorted(self.ax.get_xlim())
+        ylim = sorted(self.ax.get_ylim())
+        return (xlim[0] - margin, xlim[1] + margin), (ylim[0] - margin, ylim[1] + margin)
+    
+    def evaluate(self, curve):
+        ranges = None
+        if self.culling:
+            ranges = curve.visible_parameter_ranges(*self.view_limits(self.point_radius))
+        
+        if self.adaptive:
+            return curve.evaluate_adaptive(self.data_tolerance(), ranges)
+        if ranges is not None:
+            return curve.evaluate_ranges(ranges)
+        return curve.evaluate_curve()
+    
+    def render_curve(self, curve):
+        with profiler.stage('render.total'):
+            self.render_stages(curve)
+    
+    def render_stages(self, curve):
+        if curve.control_line is None:
+            self.create_artists(curve)
         
-        self.render_control_points(curve)
+        with profiler.stage('render.control_polygon'):
+            visible = None
+            control_points = curve.points
+            if self.culling:
+                visible = curve.visible_point_mask(*self.view_limits(self.point_radius))
+                # Keep the polygon legs that leave the view from a visible point
+                legs = visible.copy()
+                legs[1:] |= visible[:-1]
+                legs[:-1] |= visible[1:]
+                rows = np.nonzero(legs)[0]
+                control_points = polyline_with_breaks(curve.points[rows], rows)
+            
+            curve.control_line.set_data(control_points[:, 0], control_points[:, 1])
+        
+        with profiler.stage('render.evaluate'):
+            if len(curve.points) < 2:
+                curve_points = curve.points
+            elif self.adaptive or self.culling:
+                curve_points = self.evaluate(curve)
+            else:
+                curve_points = curve.update_samples(curve.num_samples)
+        profiler.count('render.samples', len(curve_points))
+        profiler.count('render.control_points', len(control_points))
+        if len(curve_points) > 1:
+            self.set_curve_line(curve, curve_points)
+            curve.curve_line.set_color(curve.color)
+            curve.curve_line.set_visible(True)
+        else:
+            curve.curve_line.set_visible(False)
+            curve.curve_line_samples = None
+        
+        with profiler.stage('render.hull'):
+            hull_points = None
+            if curve.show_hull and len(curve.points) >= 3:
+                hull_points = curve.compute_convex_hull()
+            if hull_points is not None and len(hull_points) > 2:
+                curve.hull_line.set_data(hull_points[:, 0], hull_points[:, 1])
+                curve.hull_line.set_visible(True)
+            else:
+                curve.hull_line.set_visible(False)
+        
+        if curve.picked_t is not None and not curve.is_degenerate():
+            picked = curve.evaluate_at([curve.picked_t])
+            curve.pick_line.set_data(picked[:, 0], picked[:, 1])
+            curve.pick_line.set_visible(True)
+        else:
+            curve.pick_line.set_visible(False)
+        
+        with profiler.stage('render.artists'):
+            self.render_control_points(curve, visible)
 
-        self.ax.set_title(self.title, fontsize=14, fontweight='bold', color=curve.color)
+        self.ax.title.set_color(curve.color)
+    
+    def set_curve_line(self, curve, curve_points):
+        """Patch the line in place over the dirty rows while it still shows the curve's sample buffer"""
+        rows = curve.take_dirty_range()
+        buffered = curve_points is curve.samples
+        if buffered and curve.curve_line_samples is curve_points:
+            if rows is not None:
+                # set_data stored copies, so the line owns these arrays
+                x, y = curve.curve_line.get_data(orig=True)
+                x[rows] = curve_points[rows, 0]
+                y[rows] = curve_points[rows, 1]
+                curve.curve_line.recache_always()
+            return
+        curve.curve_line.set_data(curve_points[:, 0], curve_points[:, 1])
+        curve.curve_line_samples = curve_points if buffered else None
     
-    def render_control_points(self, curve):
+    def control_point_colors(self, curve, visible=None):
         if isinstance(curve, BezierCurve):
-            colors = ['#4ECDC4' if i in [0, len(curve.points)-1] else '#45B7D1' 
-                     for i in range(len(curve.points))]
+            colors = np.full(len(curve.points), '#45B7D1')
+            colors[[0, -1]] = '#4ECDC4'
         else: 
-            colors = ['#9B59B6'] * len(curve.points)
+            colors = np.full(len(curve.points), '#9B59B6')
+        return colors if visible is None else colors[visible]
+    
+    def render_control_points(self, curve, visible=None):
+        offsets = curve.points if visible is None else curve.points[visible]
+        
+        collection = curve.points_collection
+        if collection is not None and len(collection.get_offsets()) == len(offsets):
+            collection.set_offsets(offsets)
+            if visible is not None:
+                collection.set_facecolor(self.control_point_colors(curve, visible))
+            return
+        
+        # The point count changed: this is the only case where the collection is rebuilt
+        if collection is not None:
+            self.untrack(collection)
+            collection.remove()
         
-        for i, (point, color) in enumerate(zip(curve.points, colors)):
-            circle = patches.Circle(point, 0.1, facecolor=color, edgecolor='black', 
-                                  linewidth=2, zorder=10)
-            self.ax.add_patch(circle)
-            curve.points_patches.append(circle)
+        count = len(offsets)
+        diameters = np.full(count, 2 * self.point_radius)
+        curve.points_collection = EllipseCollection(
+            diameters, diameters, np.zeros(count), units='xy',
+            offsets=offsets, offset_transform=self.ax.transData,
+            facecolors=self.control_point_colors(curve, visible), edgecolors='black',
+            linewidths=2, zorder=10
+        )
+        self.ax.add_collection(curve.points_collection, autolim=False)
+        if self.blit_manager is not None:
+            self.blit_manager.add_artist(curve.points_collection)
+    
+    def untrack(self, artist):
+        if self.blit_manager is not None:
+            self.blit_manager.remove_artist(artist)
     
     def clear_curve(self, curve):
-        for patch in curve.points_patches:
-            patch.remove()
-        curve.points_patches.clear()
+        if curve.points_collection is not None:
+            self.untrack(curve.points_collection)
+            curve.points_collection.remove()
+        curve.points_collection = None
         
-        for line in [curve.curve_line, curve.control_line, curve.hull_line]:
+        for line in [curve.curve_line, curve.control_line, curve.hull_line, curve.pick_line]:
             if line is not None:
+                self.untrack(line)
                 line.remove()
         
+        curve.pick_line = None
         curve.curve_line = None
         curve.control_line = None
-        curve.hull_line = None
\ No newline at end of file
+        curve.hull_line = None
@@ -0,0 +1,215 @@
+import numpy as np
+from batch_eval import evaluate_batch
+from convex_hull import monotone_chain
+from spatial_index import PointGrid
+
+KINDS = ('bezier', 'bspline')
+
+
+class CurveScene:
+    """Many curves in one structure-of-arrays store, evaluated in groups that share a topology.
+
+    All control points live in one contiguous (N, 2) array; curve i owns the rows
+    offsets[i]:offsets[i] + counts[i]. Curves with the same (type, degree, point count) form
+    a group whose samples are one (k, m, 2) array produced by a single batched basis product.
+    Moving a point only re-evaluates the curves it belongs to. Curve ids are positions in the
+    store, so removing a curve shifts the ids of the curves after it.
+    """
+
+    def __init__(self, capacity=1024):
+        self.points = np.empty((capacity, 2))
+        self.num_points = 0
+
+        self.offsets = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.kinds = np.empty(0, dtype=np.uint8)
+        self.degrees = np.empty(0, dtype=np.int64)
+        self.styles = np.empty(0, dtype=np.int64)
+        self.show_hull = np.empty(0, dtype=bool)
+        self.style_colors = []
+
+        self.version = 0
+        self.group_keys = None
+        self.group_members = None
+        self.group_samples = None
+        self.curve_group = None
+        self.curve_slot = None
+        self.dirty = set()
+        self.spatial_index = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def control_points(self):
+        return self.points[:self.num_points]
+
+    def style_index(self, color):
+        if color not in self.style_colors:
+            self.style_colors.append(color)
+        return self.style_colors.index(color)
+
+    def reserve(self, count):
+        if count <= len(self.points):
+            return
+        grown = np.empty((max(count, 2 * len(self.points)), 2))
+        grown[:self.num_points] = self.control_points
+        self.points = grown
+
+    def add_curves(self, kind, points, degree=3, color='#45B7D1'):
+        """Append a stack of curves sharing one topology: points (k, n, 2); returns their ids"""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown curve type: {kind!r}")
+
+        points = np.asarray(points, dtype=float)
+        k, n = points.shape[:2]
+        if kind == 'bezier':
+            degree = n - 1
+
+        first = len(self)
+        self.reserve(self.num_points + k * n)
+        self.points[self.num_points:self.num_points + k * n] = points.reshape(-1, 2)
+
+        self.offsets = np.concatenate([self.offsets, self.num_points + n * np.arange(k)])
+        self.counts = np.concatenate([self.counts, np.full(k, n)])
+        self.kinds = np.concatenate([self.kinds, np.full(k, KINDS.index(kind), dtype=np.uint8)])
+        self.degrees = np.concatenate([self.degrees, np.full(k, degree)])
+        self.styles = np.concatenate([self.styles, np.full(k, self.style_index(color))])
+        self.show_hull = np.concatenate([self.show_hull, np.zeros(k, dtype=bool)])
+        self.num_points += k * n
+
+        self.invalidate()
+        return np.arange(first, first + k)
+
+    def add_curve(self, kind, points, degree=3, color='#45B7D1'):
+        return int(self.add_curves(kind, [points], degree, color)[0])
+
+    def remove_curve(self, curve):
+        start, count = self.offsets[curve], self.counts[curve]
+        self.points[start:self.num_points - count] = self.points[start + count:self.num_points].copy()
+        self.num_points -= count
+
+        keep = np.arange(len(self)) != curve
+        self.offsets = np.where(np.arange(len(self)) > curve, self.offsets - count, self.offsets)[keep]
+        self.counts = self.counts[keep]
+        self.kinds = self.kinds[keep]
+        self.degrees = self.degrees[keep]
+        self.styles = self.styles[keep]
+        self.show_hull = self.show_hull[keep]
+        self.invalidate()
+
+    def invalidate(self):
+        # The topology changed: groups, samples and the spatial index are rebuilt on demand
+        self.version += 1
+        self.group_keys = None
+        self.group_members = None
+        self.group_samples = None
+        self.dirty.clear()
+        self.spatial_index = None
+
+    def kind(self, curve):
+        return KINDS[self.kinds[curve]]
+
+    def color(self, curve):
+        return self.style_colors[self.styles[curve]]
+
+    def curve_points(self, curve):
+        start = self.offsets[curve]
+        return self.points[start:start + self.counts[curve]]
+
+    def gather(self, curves, n):
+        """Control points of curves that all have n points: (k, n, 2)"""
+        return self.points[self.offsets[curves][:, np.newaxis] + np.arange(n)]
+
+    def build_groups(self):
+        keys = np.column_stack([self.kinds, self.degrees, self.counts])
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(unique) + 1))
+
+        self.group_keys = [(KINDS[kind], int(degree), int(n)) for kind, degree, n in unique]
+        self.group_members = [order[bounds[g]:bounds[g + 1]] for g in range(len(unique))]
+        self.curve_group = inverse
+        self.curve_slot = np.empty(len(self), dtype=np.int64)
+        for members in self.group_members:
+            self.curve_slot[members] = np.arange(len(members))
+        self.group_samples = [None] * len(unique)
+
+    def evaluate(self):
+        """Bring every group's samples up to date; returns the list of (k, m, 2) sample arrays"""
+        if self.group_keys is None:
+            self.build_groups()
+
+        for g, (kind, degree, n) in enumerate(self.group_keys):
+            if self.group_samples[g] is None:
+                self.group_samples[g] = evaluate_batch(kind, self.gather(self.group_members[g], n), degree)
+
+        if self.dirty:
+            dirty = np.fromiter(self.dirty, dtype=np.int64, count=len(self.dirty))
+            self.dirty.clear()
+            for g in np.unique(self.curve_group[dirty]):
+                curves = dirty[self.curve_group[dirty] == g]
+                kind, degree, n = self.group_keys[g]
+                self.group_samples[g][self.curve_slot[curves]] = evaluate_batch(kind, self.gather(curves, n), degree)
+
+        return self.group_samples
+
+    def curve_samples(self, curve):
+        return self.group_samples[self.curve_group[curve]][self.curve_slot[curve]]
+
+    def update_point(self, curve, index, x, y):
+        row = self.offsets[curve] + index
+        self.points[row] = (x, y)
+        self.dirty.add(int(curve))
+        if self.spatial_index is not None:
+            self.spatial_index.move(row, self.points[row])
+
+    def nearest_point(self, x, y, threshold=0.2):
+        """(curve, point index) of the control point within threshold of (x, y), or (-1, -1)"""
+        if self.spatial_index is None:
+            self.spatial_index = PointGrid(self.control_points, threshold)
+        row = self.spatial_index.nearest(self.control_points, x, y, threshold)
+        if row < 0:
+            return -1, -1
+        curve = int(np.searchsorted(self.offsets, row, side='right') - 1)
+        return curve, int(row - self.offsets[curve])
+
+    def pick_curve(self, x, y, threshold=0.2):
+        """Id of the curve passing closest to (x, y) within threshold, or -1"""
+        best, best_distance = -1, threshold
+        # evaluate() first: it rebuilds the groups after a topology change
+        samples_by_group = self.evaluate()
+        for members, samples in zip(self.group_members, samples_by_group):
+            offsets = samples - (x, y)
+            distances = np.hypot(offsets[..., 0], offsets[..., 1]).min(axis=1)
+            closest = np.argmin(distances)
+            if distances[closest] < best_distance:
+                best, best_distance = int(members[closest]), distances[closest]
+        return best
+
+    def toggle_hull(self, curve):
+        self.show_hull[curve] = not self.show_hull[curve]
+
+    def hull(self, curve):
+        """Closed convex hull polygon of one curve's control points"""
+        points = self.curve_points(curve)
+        vertices = monotone_chain(points, range(len(points)))
+        return points[vertices + vertices[:1]]
+
+
+def random_scene(count, seed=0, extent=(0, 60, 0, 50)):
+    """Demo scene: count short cubic Bézier and B-spline curves scattered over extent"""
+    rng = np.random.default_rng(seed)
+    scene = CurveScene(capacity=6 * count)
+
+    x0, x1, y0, y1 = extent
+    origins = np.column_stack([rng.uniform(x0, x1 - 3, count), rng.uniform(y0, y1 - 2, count)])
+    bezier_count = count // 2
+    for kind, n, color, curves in [('bezier', 4, '#45B7D1', slice(0, bezier_count)),
+                                   ('bspline', 6, '#9B59B6', slice(bezier_count, count))]:
+        k = len(origins[curves])
+        shape = np.column_stack([np.linspace(0, 3, n), np.zeros(n)])
+        shape = shape + rng.uniform(-0.5, 0.5, (k, n, 2)) + (0, 1)
+        scene.add_curves(kind, origins[curves][:, np.newaxis] + shape, color=color)
+    return scene
@@ -0,0 +1,134 @@
+"""Compact binary curve store readable through np.memmap.
+
+Layout (little endian):
+    header  64 bytes  magic, version, float size, curve count, point count, index/data offsets
+    data    (points, 2) float32 or float64, every curve's control points back to back
+    index   offsets int64 (count + 1), kinds uint8 (count), degrees uint16 (count)
+The index follows the data so curves can be streamed to disk without knowing their number up front.
+"""
+import contextlib
+import os
+import numpy as np
+from bezier_curve import BezierCurve
+from bspline_curve import BSplineCurve
+from nurbs_curve import NURBSCurve
+
+MAGIC = b'BBSCURVE'
+VERSION = 1
+HEADER = np.dtype([
+    ('magic', 'S8'), ('version', '<u4'), ('itemsize', '<u4'),
+    ('count', '<u8'), ('total_points', '<u8'),
+    ('index_offset', '<u8'), ('data_offset', '<u8'), ('reserved', 'S16')
+])
+KINDS = {'bezier': 0, 'bspline': 1}
+KIND_NAMES = {code: name for name, code in KINDS.items()}
+
+
+def curve_record(curve):
+    # The format has no room for weights or knot vectors yet; refuse instead of saving a different curve
+    if isinstance(curve, NURBSCurve):
+        raise ValueError("Curve stores cannot hold NURBS weights")
+    if isinstance(curve, BSplineCurve):
+        if curve.custom_knots is not None:
+            raise ValueError("Curve stores only hold clamped uniform knot vectors")
+        return 'bspline', curve.points, curve.degree
+    if isinstance(curve, BezierCurve):
+        return 'bezier', curve.points, 0
+    return curve
+
+
+def write_curve_store(path, curves, dtype=np.float64):
+    """Write curves (CurveBase objects or (kind, points, degree) tuples) to path, replacing it atomically"""
+    dtype = np.dtype(dtype).newbyteorder('<')
+    offsets = [0]
+    kinds = []
+    degrees = []
+    
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(np.zeros(1, HEADER).tobytes())
+            for curve in curves:
+                kind, points, degree = curve_record(curve)
+                points = np.asarray(points, dtype=dtype).reshape(-1, 2)
+                f.write(points.tobytes())
+                offsets.append(offsets[-1] + len(points))
+                kinds.append(KINDS[kind])
+                degrees.append(degree)
+            
+            index_offset = f.tell()
+            f.write(np.asarray(offsets, dtype='<i8').tobytes())
+            f.write(np.asarray(kinds, dtype='u1').tobytes())
+            f.write(np.asarray(degrees, dtype='<u2').tobytes())
+            
+            header = np.zeros(1, HEADER)
+            header[0] = (MAGIC, VERSION, dtype.itemsize, len(kinds), offsets[-1],
+                         index_offset, HEADER.itemsize, b'')
+            f.seek(0)
+            f.write(header.tobytes())
+    except BaseException:
+        # An unsupported curve must not leave a half-written file behind
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+    
+    os.replace(temp_path, path)
+
+
+class CurveStore:
+    """Memory-mapped view of a curve store; points are served as zero-copy slices of the file.
+
+    mode='c' (copy-on-write) lets curves built from the store be dragged in memory
+    without ever writing back to the file.
+    """
+    
+    def __init__(self, path, mode='c'):
+        self.path = path
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        if len(header) == 0 or header[0]['magic'] != MAGIC:
+            raise ValueError(f"{path} is not a curve store")
+        if header[0]['version'] != VERSION:
+            raise ValueError(f"Unsupported curve store version {header[0]['version']}")
+        
+        self.count = int(header[0]['count'])
+        total_points = int(header[0]['total_points'])
+        index_offset = int(header[0]['index_offset'])
+        dtype = np.dtype('<f4' if header[0]['itemsize'] == 4 else '<f8')
+        
+        self.offsets = np.memmap(path, dtype='<i8', mode='r', offset=index_offset,
+                                 shape=(self.count + 1,))
+        self.kinds = np.memmap(path, dtype='u1', mode='r', offset=index_offset + 8 * (self.count + 1),
+                               shape=(self.count,))
+        self.degrees = np.memmap(path, dtype='<u2', mode='r', offset=index_offset + 9 * self.count + 8,
+                                 shape=(self.count,))
+        self.data = np.memmap(path, dtype=dtype, mode=mode, offset=int(header[0]['data_offset']),
+                              shape=(total_points, 2)) if total_points else np.empty((0, 2), dtype)
+    
+    def __len__(self):
+        return self.count
+    
+    def close(self):
+        """Drop the store's references to the mapping.
+
+        The file is unmapped once every curve built from the store owns its points again
+        (set_points with copy=True). Windows cannot replace a file that is still mapped.
+        """
+        self.offsets = self.kinds = self.degrees = self.data = None
+    
+    def points(self, index):
+        return self.data[self.offsets[index]:self.offsets[index + 1]]
+    
+    def kind(self, index):
+        return KIND_NAMES[int(self.kinds[index])]
+    
+    def degree(self, index):
+        return int(self.degrees[index])
+    
+    def curve(self, index, color='#45B7D1'):
+        if self.kind(index) == 'bspline':
+            return BSplineCurve(self.points(index), self.degree(index), color, copy=False)
+        return BezierCurve(self.points(index), color, copy=False)
+    
+    def curves(self):
+        for index in range(self.count):
+            yield self.curve(index)
@@ -1,109 +1,194 @@
 import numpy as np
-import matplotlib.patches as patches
-import matplotlib.animation as animation
+from matplotlib.collections import EllipseCollection
+from kernel_backends import kernels
+from frame_profiler import profiler
 
 
 class DeCasteljauAnimator:
     
-    def __init__(self, ax, bezier_curve):
+    def __init__(self, ax, bezier_curve, blit_manager=None):
         self.ax = ax
         self.bezier_curve = bezier_curve
+        self.blit_manager = blit_manager
         self.animation_active = False
         self.animation_obj = None
+        self.timer = None
+        self.frame = 0
         self.t_current = 0.0
         self.animation_speed = 0.02
+        self.constant_speed = False
+        self.use_frame_cache = True
+        
+        self.frame_cache = None
+        self.frame_cache_key = None
+        self.frame_t_cache = None
+        self.frame_t_cache_key = None
         
         self.construction_lines = []
         self.construction_points = []
+        self.final_point = None
         self.trace_points = []
+        self.trace_t = None
         self.trace_line = None
         
         self.level_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57', '#FF9FF3']
     
+    def track(self, artist):
+        if self.blit_manager is not None:
+            self.blit_manager.add_artist(artist)
+        return artist
+    
+    def untrack(self, artist):
+        if self.blit_manager is not None:
+            self.blit_manager.remove_artist(artist)
+        artist.remove()
+    
     def clear_animation_elements(self):
-        for lines in self.construction_lines:
-            for line in lines:
-                if line in self.ax.lines:
-                    line.remove()
+        for artist in self.construction_lines + self.construction_points:
+            self.untrack(artist)
         self.construction_lines.clear()
-        
-        for points in self.construction_points:
-            for point in points:
-                if point in self.ax.patches:
-                    point.remove()
         self.construction_points.clear()
         
-        if self.trace_line and self.trace_line in self.ax.lines:
-            self.trace_line.remove()
+        for artist in [self.final_point, self.trace_line]:
+            if artist is not None:
+                self.untrack(artist)
+        self.final_point = None
         self.trace_line = None
         self.trace_points.clear()
+        self.trace_t = None
     
-    def draw_construction_step(self, t):
-        if len(self.bezier_curve.points) < 2:
-            return
-        
+    def point_collection(self, count, radius, color, linewidth, alpha, zorder):
+        diameters = np.full(count, 2 * radius)
+        collection = EllipseCollection(
+            diameters, diameters, np.zeros(count), units='xy',
+            offsets=np.zeros((count, 2)), offset_transform=self.ax.transData,
+            facecolors=color, edgecolors='black', linewidths=linewidth,
+            alpha=alpha, zorder=zorder
+        )
+        self.ax.add_collection(collection, autolim=False)
+        return self.track(collection)
+    
+    def create_construction_artists(self, n):
+        """One polyline per level and one point collection per intermediate level, reused by every frame"""
         self.clear_animation_elements()
         
-        levels = self.bezier_curve.de_casteljau_all_levels(self.bezier_curve.points, t)
-        
-        for level_idx, level_points in enumerate(levels[:-1]): 
-            if len(level_points) < 2:
-                continue
-                
-            level_lines = []
-            level_point_patches = []
-            
+        for level_idx in range(n - 1):
             color = self.level_colors[level_idx % len(self.level_colors)]
-            
-            for i in range(len(level_points) - 1):
-                line, = self.ax.plot([level_points[i][0], level_points[i+1][0]], 
-                                   [level_points[i][1], level_points[i+1][1]], 
-                                   color=color, linewidth=2, alpha=0.7)
-                level_lines.append(line)
+            line, = self.ax.plot([], [], color=color, linewidth=2, alpha=0.7)
+            self.construction_lines.append(self.track(line))
             
             if level_idx > 0:
-                for point in level_points:
-                    circle = patches.Circle(point, 0.05, facecolor=color, 
-                                          edgecolor='black', linewidth=1, 
-                                          alpha=0.8, zorder=8)
-                    self.ax.add_patch(circle)
-                    level_point_patches.append(circle)
-            
-            self.construction_lines.append(level_lines)
-            self.construction_points.append(level_point_patches)
+                self.construction_points.append(
+                    self.point_collection(n - level_idx, 0.05, color, 1, 0.8, 8))
         
-        final_point = levels[-1][0]
-        final_circle = patches.Circle(final_point, 0.08, facecolor='red', 
-                                    edgecolor='black', linewidth=2, 
-                                    alpha=1.0, zorder=10)
-        self.ax.add_patch(final_circle)
-        self.construction_points.append([final_circle])
+        self.final_point = self.point_collection(1, 0.08, 'red', 2, 1.0, 10)
+        self.trace_line, = self.ax.plot([], [], color=self.bezier_curve.color, linewidth=3, alpha=0.8)
+        self.track(self.trace_line)
+    
+    def frame_t_values(self):
+        frames = int(1.0 / self.animation_speed)
+        if self.constant_speed and len(self.bezier_curve.points) >= 2:
+            # Equal arc-length steps, so the traced point moves at uniform speed
+            return self.bezier_curve.constant_speed_parameters(frames, endpoint=False)
+        return (np.arange(frames) * self.animation_speed) % 1.0
+    
+    def frame_cache_token(self):
+        # Control points only change through the curve, which bumps its version
+        return (self.bezier_curve.version, self.animation_speed, self.constant_speed)
+    
+    def get_frame_t_values(self):
+        """frame_t_values() cached under the frame cache key (the constant-speed solve is not free)"""
+        key = self.frame_cache_token()
+        if self.frame_t_cache is None or self.frame_t_cache_key != key:
+            self.frame_t_cache = self.frame_t_values()
+            self.frame_t_cache_key = key
+        return self.frame_t_cache
+    
+    def get_frame_cache(self):
+        key = self.frame_cache_token()
+        if self.frame_cache is None or self.frame_cache_key != key:
+            self.frame_cache = kernels.de_casteljau_levels_batch(self.bezier_curve.points, self.get_frame_t_values())
+            self.frame_cache_key = key
+        return self.frame_cache
+    
+    def update_construction(self, levels, trace):
+        n = len(levels)
+        if len(self.construction_lines) != n - 1 or self.final_point is None:
+            self.create_construction_artists(n)
+        
+        for level_idx, line in enumerate(self.construction_lines):
+            level_points = levels[level_idx, :n - level_idx]
+            line.set_data(level_points[:, 0], level_points[:, 1])
+        
+        for level_idx, collection in enumerate(self.construction_points, start=1):
+            collection.set_offsets(levels[level_idx, :n - level_idx])
         
-        self.trace_points.append(final_point.copy())
+        self.final_point.set_offsets(levels[n - 1, :1])
+        self.trace_line.set_data(trace[:, 0], trace[:, 1])
+        self.trace_line.set_color(self.bezier_curve.color)
+    
+    def draw_construction_step(self, t):
+        if len(self.bezier_curve.points) < 2:
+            return
+        
+        levels = kernels.de_casteljau_levels_batch(self.bezier_curve.points, [t])[0]
+        # A new sweep starts a new trace, like frames[:frame + 1] on the cached path
+        if self.trace_t is not None and t <= self.trace_t:
+            self.trace_points.clear()
+        self.trace_t = t
+        self.trace_points.append(levels[-1, 0].copy())
+        self.update_construction(levels, np.array(self.trace_points))
+    
+    def draw_cached_frame(self, frame):
+        if len(self.bezier_curve.points) < 2:
+            return
         
-        if len(self.trace_points) > 1:
-            trace_array = np.array(self.trace_points)
-            self.trace_line, = self.ax.plot(trace_array[:, 0], trace_array[:, 1], 
-                                          color=self.bezier_curve.color, 
-                                          linewidth=3, alpha=0.8)
+        frames = self.get_frame_cache()
+        n = frames.shape[1]
+        self.update_construction(frames[frame], frames[:frame + 1, n - 1, 0])
     
     def animate_frame(self, frame):
-        self.t_current = (frame * self.animation_speed) % 1.0
-        self.draw_construction_step(self.t_current)
+        with profiler.stage('animate.frame'):
+            if self.constant_speed:
+                self.t_current = self.get_frame_t_values()[frame]
+            else:
+                self.t_current = (frame * self.animation_speed) % 1.0
+            if self.use_frame_cache:
+                self.draw_cached_frame(frame)
+            else:
+                self.draw_construction_step(self.t_current)
         return []
     
+    def blit_frame(self):
+        self.animate_frame(self.frame)
+        self.frame = (self.frame + 1) % int(1.0 / self.animation_speed)
+        with profiler.stage('animate.blit'):
+            self.blit_manager.update()
+    
     def start_animation(self):
         if self.animation_active:
             return
         
         self.animation_active = True
         self.trace_points.clear()
-        
-        frames = int(1.0 / self.animation_speed)
-        self.animation_obj = animation.FuncAnimation(
-            self.ax.figure, self.animate_frame, frames=frames,
-            interval=50, repeat=True, blit=False
-        )
+        self.trace_t = None
+        
+        if self.blit_manager is not None:
+            # FuncAnimation falls back to a full draw_idle when a frame returns no artists,
+            # so the blitted path drives frames from a plain canvas timer instead
+            self.frame = 0
+            self.timer = self.ax.figure.canvas.new_timer(interval=50)
+            self.timer.add_callback(self.blit_frame)
+            self.timer.start()
+        else:
+            # The animation machinery is loaded on the first Animate only
+            import matplotlib.animation as animation
+            
+            frames = int(1.0 / self.animation_speed)
+            self.animation_obj = animation.FuncAnimation(
+                self.ax.figure, self.animate_frame, frames=frames,
+                interval=50, repeat=True, blit=False
+            )
         
         self.ax.figure.canvas.draw()
     
@@ -117,5 +202,9 @@ class DeCasteljauAnimator:
             self.animation_obj.event_source.stop()
             self.animation_obj = None
         
+        if self.timer:
+            self.timer.stop()
+            self.timer = None
+        
         self.clear_animation_elements()
-        self.ax.figure.canvas.draw()
\ No newline at end of file
+        self.ax.figure.canvas.draw()
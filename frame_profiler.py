@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+import numpy as np
+from matplotlib.figure import Figure
+
+
+class StageTimer:
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class FrameProfiler:
+    """Per-stage timers with rolling histories, an optional on-canvas HUD and a Chrome trace dump"""
+    
+    def __init__(self, history=240, enabled=False):
+        self.enabled = enabled
+        self.history = history
+        self.samples = {}
+        self.counts = {}
+        self.quantities = {}
+        self.frame_times = deque(maxlen=history)
+        self.frames = 0
+        self.sources = {}
+        
+        self.tracing = False
+        self.trace_events = []
+        self.max_trace_events = 1_000_000
+        self.trace_origin = time.perf_counter_ns()
+        
+        self.hud = None
+        self.hud_interval = 0.5
+        self.hud_updated = 0.0
+    
+    def add_source(self, name, stats):
+        """Show another component's stats() (a dict of numbers) in the report and the HUD"""
+        self.sources[name] = stats
+    
+    def stage(self, name):
+        if not self.enabled:
+            return nullcontext()
+        return StageTimer(self, name)
+    
+    def record(self, name, start_ns, end_ns):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.history)
+            self.counts[name] = 0
+        samples.append((end_ns - start_ns) / 1e6)
+        self.counts[name] += 1
+        
+        if self.tracing and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append((name, start_ns, end_ns - start_ns, threading.get_ident()))
+    
+    def count(self, name, value):
+        """Record a per-render quantity, e.g. the number of curve samples drawn"""
+        if not self.enabled:
+            return
+        values = self.quantities.get(name)
+        if values is None:
+            values = self.quantities[name] = deque(maxlen=self.history)
+        values.append(int(value))
+    
+    def frame(self, redraw=True):
+        """Mark a presented frame; drives the fps estimate and the throttled HUD refresh"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame_times.append(now)
+        self.frames += 1
+        if self.tracing and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append(('frame', time.perf_counter_ns(), None, threading.get_ident()))
+        if self.hud is not None and now - self.hud_updated >= self.hud_interval:
+            self.hud_updated = now
+            self.update_hud(redraw)
+    
+    def fps(self):
+        if len(self.frame_times) < 2:
+            return 0.0
+        elapsed = self.frame_times[-1] - self.frame_times[0]
+        return (len(self.frame_times) - 1) / elapsed if elapsed > 0 else 0.0
+    
+    def histogram(self, name, bins=20):
+        """Histogram (counts, edges in ms) of the rolling samples of one stage"""
+        return np.histogram(np.fromiter(self.samples.get(name, ()), dtype=float), bins=bins)
+    
+    def stats(self):
+        stages = {}
+        for name, samples in self.samples.items():
+            values = np.fromiter(samples, dtype=float)
+            p50, p90, p99 = np.percentile(values, [50, 90, 99])
+            stages[name] = {
+                'count': self.counts[name],
+                'window': len(values),
+                'mean_ms': float(values.mean()),
+                'p50_ms': float(p50),
+                'p90_ms': float(p90),
+                'p99_ms': float(p99),
+                'max_ms': float(values.max())
+            }
+        quantities = {name: {'last': values[-1], 'mean': float(np.mean(values)), 'max': max(values)}
+                      for name, values in self.quantities.items() if values}
+        sources = {name: stats() for name, stats in self.sources.items()}
+        return {'fps': self.fps(), 'frames': self.frames, 'stages': stages, 'quantities': quantities,
+                'sources': sources}
+    
+    def report(self):
+        stats = self.stats()
+        lines = [f"fps {stats['fps']:5.1f}  frames {stats['frames']}"]
+        for name, stage in sorted(stats['stages'].items()):
+            lines.append(f"{name:<22} {stage['mean_ms']:7.2f} ms  p90 {stage['p90_ms']:7.2f}  calls={stage['count']}")
+        for name, quantity in sorted(stats['quantities'].items()):
+            lines.append(f"{name:<22} {quantity['last']:7d}     mean {quantity['mean']:9.1f}  max {quantity['max']}")
+        for name, values in stats['sources'].items():
+            lines.append(f"{name:<22} " + '  '.join(f"{key}={value}" for key, value in values.items()))
+        return '\n'.join(lines)
+    
+    def reset(self):
+        self.samples.clear()
+        self.counts.clear()
+        self.quantities.clear()
+        self.frame_times.clear()
+        self.frames = 0
+    
+    def attach_hud(self, fig):
+        self.hud = fig.text(0.005, 0.995, '', ha='left', va='top', family='monospace', fontsize=8,
+                            bbox=dict(facecolor='white', alpha=0.8, edgecolor='none'), zorder=100)
+    
+    def update_hud(self, redraw=True):
+        self.hud.set_text(self.report())
+        if redraw:
+            # Blitted frames never repaint the figure text, so request a full draw at the HUD rate
+            self.hud.figure.canvas.draw_idle()
+    
+    def start_trace(self):
+        self.trace_events = []
+        self.trace_origin = time.perf_counter_ns()
+        self.tracing = True
+    
+    def stop_trace(self):
+        self.tracing = False
+    
+    def dump_trace(self, path):
+        """Write the recorded stages in Chrome trace format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = []
+        for name, start, duration, tid in self.trace_events:
+            event = {'name': name, 'pid': pid, 'tid': tid, 'ts': (start - self.trace_origin) / 1e3}
+            if duration is None:
+                event.update(ph='i', s='p')
+            else:
+                event.update(ph='X', dur=duration / 1e3)
+            events.append(event)
+        
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+profiler = FrameProfiler()
+
+
+class ProfiledFigure(Figure):
+    """Figure whose full draws are timed as the 'canvas.draw' stage and counted as frames"""
+    
+    def draw(self, renderer):
+        profiler.frame(redraw=False)
+        with profiler.stage('canvas.draw'):
+            super().draw(renderer)
@@ -0,0 +1,274 @@
+"""Curve-curve and curve-line intersection.
+
+Every curve is handled as a list of rational Bézier segments in homogeneous coordinates
+(CurveBase.rational_bezier_segments; polynomial curves have unit weights). A
+sweep-and-prune pass over the segment bounding boxes finds the segment pairs that may meet.
+Those pairs are subdivided together, batched, and only pieces whose boxes still overlap are
+kept (the convex hull property). Once a piece is small it is refined to machine precision
+with Newton's method on the original segments.
+"""
+import numpy as np
+from curve_kernels import de_casteljau_each, bezier_hodograph, split_bezier, homogenize, dehomogenize
+
+
+def as_homogeneous(segments):
+    segments = np.asarray(segments, dtype=float)
+    if segments.shape[-1] == 2:
+        return homogenize(segments, np.ones(segments.shape[:-1]))
+    return segments
+
+
+def segment_boxes(segments):
+    """Bounding boxes of homogeneous segments; with positive weights the curve stays inside them"""
+    points = dehomogenize(segments)
+    return points.min(axis=-2), points.max(axis=-2)
+
+
+def overlapping_pairs(lower, upper, owners=None):
+    """Sweep and prune: index pairs (i < j) of boxes that overlap, skipping boxes with the same owner"""
+    order = np.argsort(lower[:, 0], kind='stable')
+    x_start = lower[order, 0]
+    # Every box i overlaps in x with the boxes that start before it ends
+    stop = np.searchsorted(x_start, upper[order, 0], side='right')
+    counts = stop - np.arange(len(order)) - 1
+    first = np.repeat(np.arange(len(order)), counts)
+    second = first + 1 + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    i, j = order[first], order[second]
+    keep = (lower[i, 1] <= upper[j, 1]) & (lower[j, 1] <= upper[i, 1])
+    if owners is not None:
+        keep &= owners[i] != owners[j]
+    i, j = i[keep], j[keep]
+    return np.minimum(i, j), np.maximum(i, j)
+
+
+def point_at(segments, t):
+    return dehomogenize(de_casteljau_each(segments, t))
+
+
+def point_and_tangent(segments, t):
+    """Point and derivative of rational segments: C = A / w, C' = (A' - w' C) / w"""
+    value = de_casteljau_each(segments, t)
+    slope = de_casteljau_each(bezier_hodograph(segments), t)
+    point = value[:, :-1] / value[:, -1:]
+    return point, (slope[:, :-1] - slope[:, -1:] * point) / value[:, -1:]
+
+
+def bezier_pair_intersections(a, b, tolerance=1e-8, max_depth=32, max_pieces=100000):
+    """Intersections of Bézier segment pairs a[k] and b[k] (plain or homogeneous): (pair index, s, t)"""
+    a = as_homogeneous(a)
+    b = as_homogeneous(b)
+    if len(a) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+
+    scale = max(np.ptp(dehomogenize(np.concatenate([a.reshape(-1, 3), b.reshape(-1, 3)])), axis=0).max(), 1.0)
+    small = 1e-4 * scale
+    pad = tolerance * scale
+
+    owner = np.arange(len(a))
+    piece_a, piece_b = a, b
+    a_range = np.tile([0.0, 1.0], (len(a), 1))
+    b_range = a_range.copy()
+    found = []
+
+    for depth in range(max_depth + 1):
+        lower_a, upper_a = segment_boxes(piece_a)
+        lower_b, upper_b = segment_boxes(piece_b)
+        hit = ((lower_a <= upper_b + pad) & (lower_b <= upper_a + pad)).all(axis=1)
+        owner, piece_a, piece_b = owner[hit], piece_a[hit], piece_b[hit]
+        a_range, b_range = a_range[hit], b_range[hit]
+        if len(owner) == 0:
+            break
+
+        size = np.maximum((upper_a - lower_a)[hit].max(axis=1), (upper_b - lower_b)[hit].max(axis=1))
+        done = (size < small) | (depth == max_depth) | (4 * len(owner) > max_pieces)
+        found.append((owner[done], a_range[done].mean(axis=1), b_range[done].mean(axis=1)))
+
+        split = ~done
+        if not split.any():
+            break
+        owner, piece_a, piece_b = owner[split], piece_a[split], piece_b[split]
+        a_range, b_range = a_range[split], b_range[split]
+
+        # Split both pieces at their midpoints: every pair becomes four
+        a_left, a_right = split_bezier(piece_a)
+        b_left, b_right = split_bezier(piece_b)
+        a_mid = a_range.mean(axis=1)
+        b_mid = b_range.mean(axis=1)
+        a_halves = [np.column_stack([a_range[:, 0], a_mid]), np.column_stack([a_mid, a_range[:, 1]])]
+        b_halves = [np.column_stack([b_range[:, 0], b_mid]), np.column_stack([b_mid, b_range[:, 1]])]
+        piece_a = np.concatenate([a_left, a_left, a_right, a_right])
+        piece_b = np.concatenate([b_left, b_right, b_left, b_right])
+        a_range = np.concatenate([a_halves[0], a_halves[0], a_halves[1], a_halves[1]])
+        b_range = np.concatenate([b_halves[0], b_halves[1], b_halves[0], b_halves[1]])
+        owner = np.tile(owner, 4)
+
+    owner, s, t = (np.concatenate(values) for values in zip(*found)) if found else \
+        (np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))
+    return refine_pairs(a, b, owner, s, t, tolerance * scale)
+
+
+def refine_pairs(a, b, owner, s, t, tolerance, iterations=16):
+    """Newton on A(s) - B(t) = 0 from the subdivision candidates, then drop misses and duplicates"""
+    segments_a, segments_b = a[owner], b[owner]
+    for _ in range(iterations):
+        point_a, tangent_a = point_and_tangent(segments_a, s)
+        point_b, tangent_b = point_and_tangent(segments_b, t)
+        residual = point_a - point_b
+        # Solve [A'(s), -B'(t)] (ds, dt) = -residual
+        determinant = tangent_a[:, 0] * -tangent_b[:, 1] + tangent_b[:, 0] * tangent_a[:, 1]
+        regular = np.abs(determinant) > 1e-14
+        safe = np.where(regular, determinant, 1.0)
+        ds = (-residual[:, 0] * -tangent_b[:, 1] - tangent_b[:, 0] * residual[:, 1]) / safe
+        dt = (tangent_a[:, 0] * -residual[:, 1] + residual[:, 0] * tangent_a[:, 1]) / safe
+        s = np.clip(s + np.where(regular, ds, 0), 0, 1)
+        t = np.clip(t + np.where(regular, dt, 0), 0, 1)
+
+    distance = np.hypot(*(point_at(segments_a, s) - point_at(segments_b, t)).T)
+    hit = np.nonzero(distance <= tolerance)[0]
+    keep = hit[unique_rows(owner[hit], s[hit], t[hit])]
+    return owner[keep], s[keep], t[keep]
+
+
+def unique_rows(*keys, resolution=1e-7):
+    """Indices of the rows left after sorting by keys and merging neighbours whose keys all agree within resolution"""
+    order = np.lexsort(keys[::-1])
+    duplicate = np.zeros(len(order), dtype=bool)
+    if len(order) > 1:
+        duplicate[1:] = np.all([np.abs(np.diff(np.asarray(key)[order])) < resolution for key in keys], axis=0)
+    return order[~duplicate]
+
+
+def bezier_line_intersections(segments, p0, p1, tolerance=1e-8, max_depth=40):
+    """Roots of the signed distance of Bézier segments (plain or homogeneous) to the line through p0, p1"""
+    segments = as_homogeneous(segments)
+    p0 = np.asarray(p0, dtype=float)
+    direction = np.asarray(p1, dtype=float) - p0
+    normal = np.array([-direction[1], direction[0]]) / np.hypot(*direction)
+
+    # w(t) times the distance to the line is itself a 1D Bézier curve with control values
+    # w_i n.(P_i - p0); positive weights leave its sign, and so its roots, unchanged
+    distances = ((segments[..., :-1] - segments[..., -1:] * p0) @ normal)[..., np.newaxis]
+    owner = np.arange(len(segments))
+    pieces = distances
+    ranges = np.tile([0.0, 1.0], (len(segments), 1))
+    found = []
+    for depth in range(max_depth + 1):
+        crosses = (pieces.min(axis=(1, 2)) <= 0) & (pieces.max(axis=(1, 2)) >= 0)
+        owner, pieces, ranges = owner[crosses], pieces[crosses], ranges[crosses]
+        if len(owner) == 0:
+            break
+        done = (ranges[:, 1] - ranges[:, 0] < 1e-4) | (depth == max_depth)
+        found.append((owner[done], ranges[done].mean(axis=1)))
+
+        owner, pieces, ranges = owner[~done], pieces[~done], ranges[~done]
+        if len(owner) == 0:
+            break
+        left, right = split_bezier(pieces)
+        middle = ranges.mean(axis=1)
+        pieces = np.concatenate([left, right])
+        ranges = np.concatenate([np.column_stack([ranges[:, 0], middle]), np.column_stack([middle, ranges[:, 1]])])
+        owner = np.tile(owner, 2)
+
+    if not found:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    owner, s = (np.concatenate(values) for values in zip(*found))
+
+    values = distances[owner]
+    slopes = bezier_hodograph(values)
+    for _ in range(16):
+        value = de_casteljau_each(values, s)[:, 0]
+        slope = de_casteljau_each(slopes, s)[:, 0]
+        step = np.divide(value, slope, out=np.zeros_like(value), where=np.abs(slope) > 1e-14)
+        s = np.clip(s - step, 0, 1)
+
+    scale = max(np.ptp(dehomogenize(segments).reshape(-1, 2), axis=0).max(), 1.0)
+    residual = (point_at(segments[owner], s) - p0) @ normal
+    hit = np.nonzero(np.abs(residual) <= tolerance * scale)[0]
+    keep = hit[unique_rows(owner[hit], s[hit])]
+    return owner[keep], s[keep]
+
+
+def global_parameters(ranges, index, s):
+    return ranges[index, 0] + s * (ranges[index, 1] - ranges[index, 0])
+
+
+def intersect_curves(curve_a, curve_b, tolerance=1e-8):
+    """All intersections of two curves: parameters t_a, t_b and the intersection points"""
+    segments_a, ranges_a = curve_a.rational_bezier_segments()
+    segments_b, ranges_b = curve_b.rational_bezier_segments()
+    if len(segments_a) == 0 or len(segments_b) == 0:
+        return np.empty(0), np.empty(0), np.empty((0, 2))
+
+    lower_a, upper_a = segment_boxes(segments_a)
+    lower_b, upper_b = segment_boxes(segments_b)
+    owners = np.repeat([0, 1], [len(segments_a), len(segments_b)])
+    i, j = overlapping_pairs(np.concatenate([lower_a, lower_b]), np.concatenate([upper_a, upper_b]), owners)
+    j = j - len(segments_a)
+
+    pair, s, t = bezier_pair_intersections(segments_a[i], segments_b[j], tolerance)
+    t_a = global_parameters(ranges_a, i[pair], s)
+    t_b = global_parameters(ranges_b, j[pair], t)
+    points = point_at(segments_a[i[pair]], s)
+    # Hits on a shared segment end point are found by both neighbouring segments
+    keep = unique_rows(t_a, t_b)
+    return t_a[keep], t_b[keep], points[keep]
+
+
+def intersect_curve_line(curve, p0, p1, segment=True, tolerance=1e-8):
+    """Intersections of a curve with the line through p0 and p1 (or only the segment p0-p1)"""
+    segments, ranges = curve.rational_bezier_segments()
+    if len(segments) == 0:
+        return np.empty(0), np.empty((0, 2))
+
+    index, s = bezier_line_intersections(segments, p0, p1, tolerance)
+    points = point_at(segments[index], s)
+    t = global_parameters(ranges, index, s)
+    if segment:
+        direction = np.asarray(p1, dtype=float) - p0
+        along = (points - p0) @ direction / (direction @ direction)
+        inside = (along >= -tolerance) & (along <= 1 + tolerance)
+        t, points = t[inside], points[inside]
+    keep = unique_rows(t)
+    return t[keep], points[keep]
+
+
+def intersect_all(curves, tolerance=1e-8):
+    """Intersections between every pair of different curves.
+
+    Returns (first, second, t_first, t_second, points), one row per intersection, first < second.
+    Segment pairs are found with one sweep over all segment boxes and evaluated grouped by
+    their degrees.
+    """
+    segments, ranges, owners = [], [], []
+    for index, curve in enumerate(curves):
+        curve_segments, curve_ranges = curve.rational_bezier_segments()
+        segments.extend(curve_segments)
+        ranges.append(curve_ranges)
+        owners.append(np.full(len(curve_segments), index))
+    empty = np.empty(0, dtype=np.int64)
+    if not segments:
+        return empty, empty, np.empty(0), np.empty(0), np.empty((0, 2))
+
+    ranges = np.concatenate(ranges)
+    owners = np.concatenate(owners)
+    lower = np.array([dehomogenize(segment).min(axis=0) for segment in segments])
+    upper = np.array([dehomogenize(segment).max(axis=0) for segment in segments])
+    i, j = overlapping_pairs(lower, upper, owners)
+    sizes = np.array([len(segment) for segment in segments])
+
+    results = []
+    for size_i, size_j in set(zip(sizes[i].tolist(), sizes[j].tolist())):
+        group = (sizes[i] == size_i) & (sizes[j] == size_j)
+        gi, gj = i[group], j[group]
+        pair, s, t = bezier_pair_intersections(np.stack([segments[k] for k in gi]),
+                                               np.stack([segments[k] for k in gj]), tolerance)
+        points = point_at(np.stack([segments[k] for k in gi[pair]]), s) if len(pair) else np.empty((0, 2))
+        results.append((owners[gi[pair]], owners[gj[pair]],
+                        global_parameters(ranges, gi[pair], s), global_parameters(ranges, gj[pair], t), points))
+
+    first, second, t_first, t_second, points = (np.concatenate(values) for values in zip(*results)) if results else \
+        (empty, empty, np.empty(0), np.empty(0), np.empty((0, 2)))
+    # Hits on a shared segment end point are found by both neighbouring segments
+    keep = unique_rows(first, second, t_first, t_second)
+    return first[keep], second[keep], t_first[keep], t_second[keep], points[keep]
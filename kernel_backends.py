@@ -0,0 +1,98 @@
+"""Pluggable implementations of the hot curve kernels.
+
+The pure-NumPy kernels in curve_kernels.py are the default. When numba is installed, 'auto'
+selects JIT-compiled versions (numba_kernels.py) whose machine code is cached on disk, so only
+the very first run pays for compilation. Selection order: set_backend(), then the
+CURVE_KERNEL_BACKEND environment variable ('auto', 'numpy' or 'numba'), then 'auto'.
+
+Callers go through the shared `kernels` object, e.g. kernels.de_casteljau_batch(points, t).
+The selected backend is imported on the first kernel call, so numba never slows down startup.
+"""
+import importlib.util
+import os
+import curve_kernels
+
+KERNELS = ('de_casteljau_batch', 'de_casteljau_levels_batch', 'apply_local_basis', 'bspline_evaluate',
+           'basis_function')
+BACKENDS = ('numpy', 'numba')
+
+
+class KernelBackend:
+    
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+        for kernel in KERNELS:
+            setattr(self, kernel, getattr(module, kernel))
+
+
+class ActiveKernels:
+    """The kernels of the selected backend; loads it on first use"""
+    
+    def __init__(self):
+        self.requested = os.environ.get('CURVE_KERNEL_BACKEND', 'auto')
+        self.backend = None
+    
+    def __getattr__(self, name):
+        # Only reached while no backend is loaded (afterwards the kernels are plain attributes)
+        if name not in KERNELS:
+            raise AttributeError(name)
+        self.use(load_backend(self.requested))
+        return getattr(self, name)
+    
+    def use(self, backend):
+        self.backend = backend
+        for kernel in KERNELS:
+            setattr(self, kernel, getattr(backend, kernel))
+
+
+kernels = ActiveKernels()
+
+
+def numba_available():
+    return importlib.util.find_spec('numba') is not None
+
+
+def available_backends():
+    return [name for name in BACKENDS if name != 'numba' or numba_available()]
+
+
+def load_backend(name):
+    if name not in ('auto',) + BACKENDS:
+        raise ValueError(f"Unknown kernel backend {name!r}; expected 'auto', 'numpy' or 'numba'")
+    if name == 'auto':
+        name = 'numba' if numba_available() else 'numpy'
+    if name == 'numpy':
+        return KernelBackend('numpy', curve_kernels)
+    
+    import numba_kernels
+    return KernelBackend('numba', numba_kernels)
+
+
+def prefer_backend(name):
+    """Default to name unless CURVE_KERNEL_BACKEND or set_backend() already chose; stays lazy"""
+    if 'CURVE_KERNEL_BACKEND' not in os.environ and kernels.backend is None:
+        kernels.requested = name
+
+
+def set_backend(name='auto'):
+    """Switch every caller of `kernels` to another backend; raises ImportError if numba is missing"""
+    kernels.requested = name
+    kernels.use(load_backend(name))
+    return kernels.backend.name
+
+
+def active_backend():
+    """Name of the backend in use, loading the selected one if no kernel has run yet"""
+    if kernels.backend is None:
+        kernels.use(load_backend(kernels.requested))
+    return kernels.backend.name
+
+
+def backend_info():
+    info = {'active': active_backend(), 'requested': kernels.requested, 'available': available_backends()}
+    if info['active'] == 'numba':
+        import numba
+        info['numba'] = numba.__version__
+        info['cache_dir'] = numba.config.CACHE_DIR or os.path.join(os.path.dirname(__file__), '__pycache__')
+    return info
@@ -1,3 +1,5 @@
+import argparse
+import os
 import matplotlib.pyplot as plt
 from bezier_curve import BezierCurve
 from bspline_curve import BSplineCurve
@@ -5,20 +7,51 @@ from curve_renderer import CurveRenderer
 from decasteljau_animator import DeCasteljauAnimator
 from color_manager import ColorManager
 from button_manager import ButtonManager
+from blit_manager import BlitManager
+from render_scheduler import RenderScheduler
+from curve_store import CurveStore, write_curve_store
+from frame_profiler import profiler, ProfiledFigure
+from curve_scene import random_scene
+from scene_renderer import SceneRenderer
+from kernel_backends import prefer_backend, set_backend
+
+# The editor evaluates one cached curve at a time, where NumPy is fast enough; importing numba
+# (and the SciPy it pulls in) would add about half a second to the first frame
+prefer_backend('numpy')
+
 
 class InteractiveCurves:
 
-    def __init__(self):
-        self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(20, 8))
+    def __init__(self, blit=False, adaptive=False, culling=False, frame_budget_ms=None, session_path=None,
+                 profile=False, profile_hud=False, trace_path=None, constant_speed=False):
+        profiler.enabled = profile or profile_hud or trace_path is not None
+        figure_class = ProfiledFigure if profiler.enabled else plt.Figure
+        self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(20, 8), FigureClass=figure_class)
         self.fig.suptitle('Animated Bézier Curves and B-Spline')
          
         self.bezier_curve = BezierCurve()
         self.bspline_curve = BSplineCurve()
+        
+        self.bezier_blitter = None
+        self.bspline_blitter = None
+        if blit and self.fig.canvas.supports_blit:
+            self.bezier_blitter = BlitManager(self.ax1)
+            self.bspline_blitter = BlitManager(self.ax2)
 
-        self.bezier_renderer = CurveRenderer(self.ax1, 'Bézier')
-        self.bspline_renderer = CurveRenderer(self.ax2, 'B-Spline')
+        self.bezier_renderer = CurveRenderer(self.ax1, 'Bézier', self.bezier_blitter)
+        self.bspline_renderer = CurveRenderer(self.ax2, 'B-Spline', self.bspline_blitter)
+        self.bezier_renderer.adaptive = adaptive
+        self.bspline_renderer.adaptive = adaptive
+        for renderer in (self.bezier_renderer, self.bspline_renderer):
+            renderer.culling = culling
+        
+        self.scheduler = None
+        if frame_budget_ms is not None:
+            self.scheduler = RenderScheduler(self.fig.canvas, frame_budget_ms)
+            profiler.add_source('scheduler', self.scheduler.stats)
         
-        self.bezier_animator = DeCasteljauAnimator(self.ax1, self.bezier_curve)
+        self.bezier_animator = DeCasteljauAnimator(self.ax1, self.bezier_curve, self.bezier_blitter)
+        self.bezier_animator.constant_speed = constant_speed
         
         self.color_manager = ColorManager()
         
@@ -27,6 +60,17 @@ class InteractiveCurves:
         self.bspline_buttons = ButtonManager(self.bspline_curve, self.bspline_renderer, 
                                            self.color_manager, 'bspline')
         
+        self.session_path = session_path
+        self.session_store = None
+        if session_path is not None and os.path.exists(session_path):
+            self.load_session(session_path)
+        
+        self.trace_path = trace_path
+        if profile_hud:
+            profiler.attach_hud(self.fig)
+        if trace_path is not None:
+            profiler.start_trace()
+        
         self.setup_ui()
         self.connect_events()
         self.update_all()
@@ -51,6 +95,43 @@ class InteractiveCurves:
         self.fig.canvas.mpl_connect('button_press_event', self.on_press_pan)
         self.fig.canvas.mpl_connect('button_release_event', self.on_release_pan)
         self.fig.canvas.mpl_connect('motion_notify_event', self.on_motion_pan)
+        if self.session_path is not None:
+            self.fig.canvas.mpl_connect('key_press_event', self.on_key)
+            self.fig.canvas.mpl_connect('close_event', lambda event: self.save_session(self.session_path))
+        if profiler.enabled:
+            self.fig.canvas.mpl_connect('close_event', self.on_close_profile)
+    
+    def on_close_profile(self, event):
+        print(profiler.report())
+        if self.trace_path is not None:
+            profiler.dump_trace(self.trace_path)
+    
+    def on_key(self, event):
+        if event.key == 'w':
+            self.save_session(self.session_path)
+    
+    def save_session(self, path):
+        if self.session_store is not None:
+            # The curves still view the loaded file; copy them out and release the mapping so
+            # the file can be replaced (os.replace onto a mapped file fails on Windows)
+            for curve in (self.bezier_curve, self.bspline_curve):
+                curve.set_points(curve.points)
+            # Artists such as the control point collections hold views as well
+            self.update_all()
+            self.session_store.close()
+            self.session_store = None
+        write_curve_store(path, [self.bezier_curve, self.bspline_curve])
+    
+    def load_session(self, path):
+        # The curves become zero-copy views of the memory-mapped file (copy-on-write while dragging)
+        store = CurveStore(path)
+        for index in range(min(len(store), 2)):
+            if store.kind(index) == 'bezier':
+                self.bezier_curve.set_points(store.points(index), copy=False)
+            else:
+                self.bspline_curve.degree = store.degree(index)
+                self.bspline_curve.set_points(store.points(index), copy=False)
+        self.session_store = store
         
     def on_press_pan(self, event):
         if event.button == 3:  
@@ -61,8 +142,17 @@ class InteractiveCurves:
         if self.pan_start is None or self.pan_ax is None:
             return
         
-        dx = event.x - self.pan_start[0]
-        dy = event.y - self.pan_start[1]
+        if self.scheduler is not None:
+            self.scheduler.submit('pan', self.pan_to, event.x, event.y)
+        else:
+            self.pan_to(event.x, event.y)
+    
+    def pan_to(self, x, y):
+        if self.pan_start is None or self.pan_ax is None:
+            return
+        
+        dx = x - self.pan_start[0]
+        dy = y - self.pan_start[1]
         
         xlim = self.pan_ax.get_xlim()
         ylim = self.pan_ax.get_ylim()
@@ -72,9 +162,14 @@ class InteractiveCurves:
         
         self.pan_ax.set_xlim(xlim[0]-dx_data, xlim[1]-dx_data)
         self.pan_ax.set_ylim(ylim[0]-dy_data, ylim[1]-dy_data)
+        # The next pan moves by the offset from here, so coalesced events end at the same view
+        self.pan_start = (x, y)
+        self.render_view_dependent(self.pan_ax, pan=True)
         self.fig.canvas.draw_idle()
 
     def on_release_pan(self, event):
+        if self.scheduler is not None:
+            self.scheduler.flush()
         self.pan_start = None
         self.pan_ax = None
         
@@ -83,17 +178,30 @@ class InteractiveCurves:
             return
             
         if event.inaxes == self.ax1:
-            self.bezier_curve.dragging = self.bezier_curve.get_closest_point_index(
-                event.xdata, event.ydata)
+            self.select(self.bezier_curve, self.bezier_renderer, event)
         elif event.inaxes == self.ax2:
-            self.bspline_curve.dragging = self.bspline_curve.get_closest_point_index(
-                event.xdata, event.ydata)
+            self.select(self.bspline_curve, self.bspline_renderer, event)
+    
+    def select(self, curve, renderer, event):
+        curve.dragging = curve.get_closest_point_index(event.xdata, event.ydata)
+        if curve.dragging < 0 and event.button == 1:
+            # No control point under the cursor: pick a point on the curve itself
+            curve.picked_t = curve.pick_curve(event.xdata, event.ydata)
+            renderer.render_curve(curve)
+            renderer.redraw()
     
     def on_release(self, event):
+        # Apply the last coalesced drag position before the drag ends
+        if self.scheduler is not None:
+            self.scheduler.flush()
         self.bezier_curve.dragging = -1
         self.bspline_curve.dragging = -1
     
     def on_motion(self, event):
+        with profiler.stage('motion'):
+            self.handle_motion(event)
+    
+    def handle_motion(self, event):
         if event.inaxes is None:
             return
         
@@ -101,14 +209,24 @@ class InteractiveCurves:
             return
         
         if self.bezier_curve.dragging >= 0 and event.inaxes == self.ax1:
-            self.bezier_curve.update_point(self.bezier_curve.dragging, event.xdata, event.ydata)
-            self.bezier_renderer.render_curve(self.bezier_curve)
-            self.ax1.figure.canvas.draw_idle()
+            self.schedule_drag('bezier', self.bezier_curve, self.bezier_renderer, event.xdata, event.ydata)
             
         elif self.bspline_curve.dragging >= 0 and event.inaxes == self.ax2:
-            self.bspline_curve.update_point(self.bspline_curve.dragging, event.xdata, event.ydata)
-            self.bspline_renderer.render_curve(self.bspline_curve)
-            self.ax2.figure.canvas.draw_idle()
+            self.schedule_drag('bspline', self.bspline_curve, self.bspline_renderer, event.xdata, event.ydata)
+    
+    def schedule_drag(self, key, curve, renderer, x, y):
+        if self.scheduler is not None:
+            self.scheduler.submit(key, self.drag_to, curve, renderer, x, y)
+        else:
+            self.drag_to(curve, renderer, x, y)
+    
+    def drag_to(self, curve, renderer, x, y):
+        if curve.dragging < 0:
+            return
+        with profiler.stage('drag.update_point'):
+            curve.update_point(curve.dragging, x, y)
+        renderer.render_curve(curve)
+        renderer.redraw()
     
     def on_scroll(self, event):
         if event.inaxes not in [self.ax1, self.ax2]:
@@ -145,7 +263,20 @@ class InteractiveCurves:
             y + (ylim[1] - y) * zoom
         ])
         
+        self.render_view_dependent(ax)
         self.fig.canvas.draw_idle()
+    
+    def render_view_dependent(self, ax, pan=False):
+        # Culling depends on the view limits, adaptive tessellation only on the zoom level
+        if ax == self.ax1:
+            renderer, curve = self.bezier_renderer, self.bezier_curve
+        elif ax == self.ax2:
+            renderer, curve = self.bspline_renderer, self.bspline_curve
+        else:
+            return
+        
+        if renderer.culling or (renderer.adaptive and not pan):
+            renderer.render_curve(curve)
         
     def update_all(self):
         self.bezier_renderer.render_curve(self.bezier_curve)
@@ -158,9 +289,123 @@ class InteractiveCurves:
         plt.show()
 
 
+class InteractiveScene:
+    """Single-axes demo of a CurveScene with thousands of curves.
+
+    Click a control point to drag it, click a curve to select it, press 'h' to toggle the
+    selected curve's convex hull.
+    """
+
+    def __init__(self, num_curves, blit=False, frame_budget_ms=None, profile=False, profile_hud=False):
+        profiler.enabled = profile or profile_hud
+        figure_class = ProfiledFigure if profiler.enabled else plt.Figure
+        self.fig, self.ax = plt.subplots(figsize=(16, 10), FigureClass=figure_class)
+        self.fig.suptitle(f'Curve Scene ({num_curves} curves)')
+        self.ax.set_xlim(0, 60)
+        self.ax.set_ylim(0, 50)
+        self.ax.set_aspect('equal')
+        self.ax.grid(True, alpha=0.3)
+
+        self.blitter = BlitManager(self.ax) if blit and self.fig.canvas.supports_blit else None
+        self.scheduler = RenderScheduler(self.fig.canvas, frame_budget_ms) if frame_budget_ms is not None else None
+        if self.scheduler is not None:
+            profiler.add_source('scheduler', self.scheduler.stats)
+
+        if profile_hud:
+            profiler.attach_hud(self.fig)
+
+        self.scene = random_scene(num_curves)
+        self.renderer = SceneRenderer(self.ax, self.scene, self.blitter)
+        self.renderer.render()
+        self.dragging = (-1, -1)
+
+        self.fig.canvas.mpl_connect('button_press_event', self.on_press)
+        self.fig.canvas.mpl_connect('button_release_event', self.on_release)
+        self.fig.canvas.mpl_connect('motion_notify_event', self.on_motion)
+        self.fig.canvas.mpl_connect('key_press_event', self.on_key)
+        if profiler.enabled:
+            self.fig.canvas.mpl_connect('close_event', lambda event: print(profiler.report()))
+
+    def on_press(self, event):
+        if event.inaxes != self.ax or event.button != 1:
+            return
+        self.dragging = self.scene.nearest_point(event.xdata, event.ydata)
+        curve = self.dragging[0]
+        if curve < 0:
+            curve = self.scene.pick_curve(event.xdata, event.ydata)
+        self.renderer.select(curve)
+        self.renderer.redraw()
+
+    def on_release(self, event):
+        if self.scheduler is not None:
+            self.scheduler.flush()
+        self.dragging = (-1, -1)
+
+    def on_motion(self, event):
+        if event.inaxes != self.ax or self.dragging[0] < 0:
+            return
+        with profiler.stage('motion'):
+            if self.scheduler is not None:
+                self.scheduler.submit('drag', self.drag_to, event.xdata, event.ydata)
+            else:
+                self.drag_to(event.xdata, event.ydata)
+
+    def drag_to(self, x, y):
+        curve, index = self.dragging
+        if curve < 0:
+            return
+        self.scene.update_point(curve, index, x, y)
+        self.renderer.update_curves([curve])
+        self.renderer.redraw()
+
+    def on_key(self, event):
+        if event.key == 'h' and self.renderer.selected >= 0:
+            self.scene.toggle_hull(self.renderer.selected)
+            self.renderer.render_hulls()
+            self.renderer.redraw()
+
+    def show(self):
+        plt.show()
+
+
 def main():
+    parser = argparse.ArgumentParser(description='Interactive Bézier and B-Spline curves')
+    parser.add_argument('--blit', action='store_true',
+                        help='redraw only the curve artists while dragging and animating')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='tessellate curves adaptively for the current zoom level')
+    parser.add_argument('--culling', action='store_true',
+                        help='skip curve spans and control points outside the current view')
+    parser.add_argument('--frame-budget', type=float, default=None, metavar='MS',
+                        help='coalesce mouse-motion updates and render at most once per MS milliseconds')
+    parser.add_argument('--session', default=None, metavar='PATH',
+                        help="restore the curves from PATH if it exists and save them there on close (or with 'w')")
+    parser.add_argument('--profile', action='store_true',
+                        help='time each render, drag and animation stage and print a summary on close')
+    parser.add_argument('--profile-hud', action='store_true',
+                        help='show fps and per-stage timings on the canvas (implies --profile)')
+    parser.add_argument('--profile-trace', default=None, metavar='PATH',
+                        help='write a Chrome trace of the session to PATH on close (implies --profile)')
+    parser.add_argument('--constant-speed', action='store_true',
+                        help='animate the De Casteljau construction at uniform arc-length speed instead of uniform t')
+    parser.add_argument('--scene', type=int, default=None, metavar='N',
+                        help='open a single-axes scene of N curves instead of the two-curve editor')
+    parser.add_argument('--backend', choices=['auto', 'numpy', 'numba'], default=None,
+                        help='curve kernel backend (default: CURVE_KERNEL_BACKEND or numpy)')
+    args = parser.parse_args()
+    if args.backend:
+        set_backend(args.backend)
+    
+    if args.scene is not None:
+        scene = InteractiveScene(args.scene, blit=args.blit, frame_budget_ms=args.frame_budget,
+                                 profile=args.profile, profile_hud=args.profile_hud)
+        scene.show()
+        return
     
-    curves = InteractiveCurves()
+    curves = InteractiveCurves(blit=args.blit, adaptive=args.adaptive, culling=args.culling,
+                               frame_budget_ms=args.frame_budget, session_path=args.session,
+                               profile=args.profile, profile_hud=args.profile_hud,
+                               trace_path=args.profile_trace, constant_speed=args.constant_speed)
     curves.show()
 
 
@@ -0,0 +1,158 @@
+"""numba JIT versions of the kernels in curve_kernels.py (same signatures and results).
+
+Each kernel is a plain loop compiled with njit(cache=True): no temporaries per De Casteljau
+level or basis degree, and the compiled code is stored next to this file (or in
+NUMBA_CACHE_DIR) for later runs. The wrappers only normalise shapes and dtypes.
+"""
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def de_casteljau_core(points, t_values, out):
+    k, n, d = points.shape
+    work = np.empty((n, d))
+    for c in range(k):
+        for j in range(len(t_values)):
+            t = t_values[j]
+            s = 1.0 - t
+            work[:, :] = points[c]
+            for r in range(1, n):
+                for i in range(n - r):
+                    for e in range(d):
+                        work[i, e] = s * work[i, e] + t * work[i + 1, e]
+            out[c, j] = work[0]
+
+
+def de_casteljau_batch(points, t_values):
+    points = np.asarray(points, dtype=float)
+    t = np.ascontiguousarray(np.atleast_1d(t_values), dtype=float)
+    n, d = points.shape[-2:]
+    stack = np.ascontiguousarray(points.reshape(-1, n, d))
+    out = np.empty((len(stack), len(t), d))
+    de_casteljau_core(stack, t, out)
+    return out.reshape(points.shape[:-2] + (len(t), d))
+
+
+@njit(cache=True)
+def de_casteljau_levels_core(points, t_values, levels):
+    n, d = points.shape
+    for j in range(len(t_values)):
+        t = t_values[j]
+        s = 1.0 - t
+        levels[j, 0] = points
+        for r in range(1, n):
+            for i in range(n - r):
+                for e in range(d):
+                    levels[j, r, i, e] = s * levels[j, r - 1, i, e] + t * levels[j, r - 1, i + 1, e]
+
+
+def de_casteljau_levels_batch(points, t_values):
+    points = np.ascontiguousarray(points, dtype=float)
+    t = np.ascontiguousarray(np.atleast_1d(t_values), dtype=float)
+    n, d = points.shape
+    levels = np.full((len(t), n, n, d), np.nan)
+    de_casteljau_levels_core(points, t, levels)
+    return levels
+
+
+@njit(cache=True)
+def find_span(knots, degree, n, t):
+    # searchsorted(side='right') - 1, clamped to [degree, n - 1]
+    lo, hi = 0, len(knots)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if knots[mid] <= t:
+            lo = mid + 1
+        else:
+            hi = mid
+    return min(max(lo - 1, degree), n - 1)
+
+
+@njit(cache=True)
+def basis_local_core(knots, degree, span, t, basis, left, right):
+    basis[0] = 1.0
+    for j in range(1, degree + 1):
+        left[j] = t - knots[span + 1 - j]
+        right[j] = knots[span + j] - t
+        saved = 0.0
+        for r in range(j):
+            temp = basis[r] / (right[r + 1] + left[j - r])
+            basis[r] = saved + right[r + 1] * temp
+            saved = left[j - r] * temp
+        basis[j] = saved
+
+
+@njit(cache=True)
+def apply_local_basis_core(indices, basis, points, out):
+    k, n, d = points.shape
+    m, width = basis.shape
+    for c in range(k):
+        for j in range(m):
+            for e in range(d):
+                total = 0.0
+                for r in range(width):
+                    total += basis[j, r] * points[c, indices[j, r], e]
+                out[c, j, e] = total
+
+
+def apply_local_basis(indices, basis, points):
+    # No (..., m, degree + 1, d) gather temporary, unlike the einsum version
+    points = np.asarray(points, dtype=float)
+    basis = np.ascontiguousarray(basis, dtype=float)
+    n, d = points.shape[-2:]
+    stack = np.ascontiguousarray(points.reshape(-1, n, d))
+    out = np.empty((len(stack), len(basis), d))
+    apply_local_basis_core(np.ascontiguousarray(indices, dtype=np.int64), basis, stack, out)
+    return out.reshape(points.shape[:-2] + (len(basis), d))
+
+
+@njit(cache=True)
+def bspline_evaluate_core(points, knots, degree, t_values, out):
+    k, n, d = points.shape
+    basis = np.empty(degree + 1)
+    left = np.empty(degree + 1)
+    right = np.empty(degree + 1)
+    for j in range(len(t_values)):
+        span = find_span(knots, degree, n, t_values[j])
+        basis_local_core(knots, degree, span, t_values[j], basis, left, right)
+        for c in range(k):
+            for e in range(d):
+                total = 0.0
+                for r in range(degree + 1):
+                    total += basis[r] * points[c, span - degree + r, e]
+                out[c, j, e] = total
+
+
+def bspline_evaluate(points, knots, degree, t_values):
+    points = np.asarray(points, dtype=float)
+    t = np.ascontiguousarray(np.atleast_1d(t_values), dtype=float)
+    n, d = points.shape[-2:]
+    stack = np.ascontiguousarray(points.reshape(-1, n, d))
+    out = np.empty((len(stack), len(t), d))
+    bspline_evaluate_core(stack, np.ascontiguousarray(knots, dtype=float), degree, t, out)
+    return out.reshape(points.shape[:-2] + (len(t), d))
+
+
+@njit(cache=True)
+def basis_function_core(i, p, t, knots):
+    # The Cox-de Boor recursion of curve_kernels.basis_function, unrolled into a triangle
+    values = np.empty(p + 1)
+    for j in range(p + 1):
+        a, b = knots[i + j], knots[i + j + 1]
+        values[j] = 1.0 if (a <= t < b) or (t == 1.0 and a <= t <= b) else 0.0
+    for q in range(1, p + 1):
+        for j in range(p + 1 - q):
+            index = i + j
+            left = 0.0
+            right = 0.0
+            if knots[index + q] - knots[index] != 0:
+                left = (t - knots[index]) / (knots[index + q] - knots[index]) * values[j]
+            if knots[index + q + 1] - knots[index + 1] != 0:
+                right = (knots[index + q + 1] - t) / (knots[index + q + 1] - knots[index + 1]) * values[j + 1]
+            values[j] = left + right
+    return values[0]
+
+
+def basis_function(i, p, t, knots):
+    return basis_function_core(i, p, float(t), np.asarray(knots, dtype=float))
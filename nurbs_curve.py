@@ -0,0 +1,76 @@
+import numpy as np
+from bspline_curve import BSplineCurve
+from curve_kernels import homogenize, dehomogenize, rational_derivative, insert_knot
+
+
+class NURBSCurve(BSplineCurve):
+    """Rational B-spline: every control point carries a positive weight.
+
+    Evaluation runs the B-spline kernels on the homogeneous points (w x, w y, w) and divides
+    by the weight afterwards, so the basis cache, dirty-region patching and culling are shared
+    with BSplineCurve. to_bezier_segments therefore returns homogeneous segments (k, n, 3).
+    Points added later get weight 1.
+    """
+    
+    def __init__(self, initial_points=None, weights=None, degree=3, color='#E67E22', copy=True, knots=None):
+        self._weights = np.ones(0)
+        super().__init__(initial_points, degree, color, copy, knots)
+        self.weights = np.ones(len(self.points)) if weights is None else weights
+    
+    @property
+    def weights(self):
+        n = len(self.points)
+        if len(self._weights) != n:
+            # Follow add_point/remove_point: new points get unit weight
+            self._weights = np.concatenate([self._weights[:n], np.ones(max(n - len(self._weights), 0))])
+        return self._weights
+    
+    @weights.setter
+    def weights(self, value):
+        weights = np.array(value, dtype=float)
+        if weights.shape != (len(self.points),):
+            raise ValueError(f"Expected {len(self.points)} weights, got {weights.size}")
+        if not np.isfinite(weights).all() or (weights <= 0).any():
+            raise ValueError("Weights must be finite and positive")
+        self._weights = weights
+        self.invalidate()
+    
+    def set_weight(self, index, weight):
+        """Change one weight; like update_point, only the samples it influences are re-evaluated"""
+        if not np.isfinite(weight) or weight <= 0:
+            raise ValueError("Weights must be finite and positive")
+        self.weights[index] = weight
+        self.version += 1
+        self.dirty_points.add(index)
+    
+    def control_net(self):
+        return homogenize(self.points, self.weights)
+    
+    def from_control_net(self, values):
+        return dehomogenize(values)
+    
+    def derivative(self, t_values, order=1):
+        t_values = np.atleast_1d(np.asarray(t_values, dtype=float))
+        n = len(self.points)
+        if n <= self.degree:
+            return np.zeros((len(t_values), 2))
+        return rational_derivative(self.points, self.weights, self.knots, self.degree, t_values, order)
+    
+    def rational_bezier_segments(self):
+        # The control net is already homogeneous
+        return self.to_bezier_segments()
+    
+    def insert_knot(self, t, times=1):
+        net, knots = insert_knot(self.control_net(), self.knots, self.degree, t, times)
+        self.set_points(dehomogenize(net))
+        self._weights = net[:, -1].copy()
+        self.custom_knots = knots
+        self.custom_knots.setflags(write=False)
+    
+    @classmethod
+    def circle(cls, center=(0.0, 0.0), radius=1.0, color='#E67E22'):
+        """Exact circle: quadratic, 9 control points, four quarter arcs with corner weights sqrt(2)/2"""
+        corners = np.array([[1, 0], [1, 1], [0, 1], [-1, 1], [-1, 0], [-1, -1], [0, -1], [1, -1], [1, 0]], dtype=float)
+        weights = np.tile([1.0, np.sqrt(0.5)], 5)[:9]
+        knots = [0, 0, 0, 0.25, 0.25, 0.5, 0.5, 0.75, 0.75, 1, 1, 1]
+        return cls(np.asarray(center) + radius * corners, weights, 2, color, knots=knots)
@@ -0,0 +1,89 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from batch_eval import evaluate_batch
+from bezier_curve import BezierCurve
+from bspline_curve import BSplineCurve
+
+
+def attach_shared(name):
+    # The parent owns (and unlinks) every block; workers only map it
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def evaluate_range(in_name, in_shape, out_name, out_shape, start, stop, kind, degree, num_samples):
+    """Worker task: evaluate curves [start, stop) straight from and into shared memory"""
+    shm_in = attach_shared(in_name)
+    shm_out = attach_shared(out_name)
+    try:
+        points = np.ndarray(in_shape, dtype=float, buffer=shm_in.buf)
+        output = np.ndarray(out_shape, dtype=float, buffer=shm_out.buf)
+        output[start:stop] = evaluate_batch(kind, points[start:stop], degree, num_samples)
+        del points, output
+    finally:
+        shm_in.close()
+        shm_out.close()
+    return start, stop
+
+
+class ParallelTessellator:
+    """Process pool evaluating stacks of curves; point data travels through shared memory, not pickles"""
+    
+    def __init__(self, workers=None, chunk_size=1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+    
+    def evaluate(self, kind, points, degree=3, num_samples=None):
+        """Same result as batch_eval.evaluate_batch: points (k, n, 2) -> (k, m, 2), in input order"""
+        points = np.asarray(points, dtype=float)
+        k, n, d = points.shape
+        num_samples = num_samples or (BezierCurve.num_samples if kind == 'bezier' else BSplineCurve.num_samples)
+        
+        degenerate = n < 2 if kind == 'bezier' else n <= degree
+        if self.workers == 1 or k <= self.chunk_size or degenerate:
+            return evaluate_batch(kind, points, degree, num_samples)
+        
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        
+        out_shape = (k, num_samples, d)
+        shm_in = shared_memory.SharedMemory(create=True, size=points.nbytes)
+        shm_out = shared_memory.SharedMemory(create=True, size=k * num_samples * d * 8)
+        try:
+            np.ndarray(points.shape, dtype=float, buffer=shm_in.buf)[:] = points
+            
+            tasks = [
+                self.pool.submit(evaluate_range, shm_in.name, points.shape, shm_out.name, out_shape,
+                                 start, min(start + self.chunk_size, k), kind, degree, num_samples)
+                for start in range(0, k, self.chunk_size)
+            ]
+            for task in tasks:
+                task.result()
+            
+            return np.ndarray(out_shape, dtype=float, buffer=shm_out.buf).copy()
+        finally:
+            shm_in.close()
+            shm_in.unlink()
+            shm_out.close()
+            shm_out.unlink()
+
+
+def tessellate_parallel(kind, points, degree=3, num_samples=None, workers=None, chunk_size=1024):
+    with ParallelTessellator(workers, chunk_size) as tessellator:
+        return tessellator.evaluate(kind, points, degree, num_samples)
@@ -0,0 +1,52 @@
+class RenderScheduler:
+    """Coalesces mouse-driven updates so only the latest one per key is rendered, at most once per frame"""
+    
+    def __init__(self, canvas, frame_budget_ms=16):
+        self.frame_budget_ms = frame_budget_ms
+        self.pending = {}
+        self.running = False
+        
+        self.received = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.frames = 0
+        
+        self.timer = canvas.new_timer(interval=frame_budget_ms)
+        self.timer.add_callback(self.flush)
+    
+    def submit(self, key, callback, *args):
+        self.received += 1
+        if key in self.pending:
+            self.coalesced += 1
+        self.pending[key] = (callback, args)
+        
+        if not self.running:
+            self.running = True
+            self.timer.start()
+    
+    def flush(self):
+        if not self.pending:
+            # Nothing arrived during the last frame: idle until the next submit
+            self.timer.stop()
+            self.running = False
+            return
+        
+        pending, self.pending = self.pending, {}
+        for callback, args in pending.values():
+            callback(*args)
+        self.processed += len(pending)
+        self.frames += 1
+    
+    def set_frame_budget(self, frame_budget_ms):
+        self.frame_budget_ms = frame_budget_ms
+        self.timer.interval = frame_budget_ms
+    
+    def stats(self):
+        return {
+            'received': self.received,
+            'coalesced': self.coalesced,
+            'processed': self.processed,
+            'frames': self.frames,
+            'pending': len(self.pending),
+            'frame_budget_ms': self.frame_budget_ms
+        }
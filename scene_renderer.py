@@ -0,0 +1,111 @@
+import numpy as np
+from matplotlib.collections import LineCollection
+from frame_profiler import profiler
+
+
+class SceneRenderer:
+    """Draws a CurveScene with one LineCollection per curve style, plus the selected curve's control polygon"""
+
+    def __init__(self, ax, scene, blit_manager=None):
+        self.ax = ax
+        self.scene = scene
+        self.blit_manager = blit_manager
+        self.selected = -1
+
+        self.collections = {}
+        self.collection_of = None
+        self.path_slot = None
+        self.rendered_version = None
+
+        self.hull_collection = LineCollection([], colors='red', linestyles='--', linewidths=1.5,
+                                              alpha=0.7, zorder=5)
+        self.ax.add_collection(self.hull_collection)
+        self.control_line, = self.ax.plot([], [], 'o--', color='gray', alpha=0.7, linewidth=1,
+                                          markersize=5, zorder=10)
+        self.track(self.hull_collection)
+        self.track(self.control_line)
+
+    def track(self, artist):
+        if self.blit_manager is not None:
+            self.blit_manager.add_artist(artist)
+
+    def untrack(self, artist):
+        if self.blit_manager is not None:
+            self.blit_manager.remove_artist(artist)
+
+    def redraw(self):
+        with profiler.stage('render.redraw'):
+            if self.blit_manager is not None:
+                self.blit_manager.update()
+            else:
+                self.ax.figure.canvas.draw_idle()
+
+    def build_collections(self):
+        """Rebuild the per-style collections after the scene topology changed"""
+        for collection in self.collections.values():
+            self.untrack(collection)
+            collection.remove()
+        self.collections = {}
+
+        scene = self.scene
+        self.collection_of = scene.styles.copy()
+        self.path_slot = np.empty(len(scene), dtype=np.int64)
+        for style, color in enumerate(scene.style_colors):
+            members = np.nonzero(scene.styles == style)[0]
+            if len(members) == 0:
+                continue
+            self.path_slot[members] = np.arange(len(members))
+            collection = LineCollection([scene.curve_samples(curve) for curve in members],
+                                        colors=color, linewidths=2, zorder=3)
+            self.ax.add_collection(collection, autolim=False)
+            self.track(collection)
+            self.collections[style] = collection
+        self.rendered_version = scene.version
+
+    def render(self):
+        with profiler.stage('render.evaluate'):
+            self.scene.evaluate()
+        with profiler.stage('render.artists'):
+            if self.rendered_version != self.scene.version:
+                self.build_collections()
+            profiler.count('render.samples', sum(samples.shape[0] * samples.shape[1]
+                                                 for samples in self.scene.group_samples))
+            self.render_hulls()
+            self.render_selection()
+
+    def update_curves(self, curves):
+        """Re-evaluate moved curves and patch only their paths"""
+        if self.rendered_version != self.scene.version:
+            self.render()
+            return
+
+        with profiler.stage('render.evaluate'):
+            self.scene.evaluate()
+        with profiler.stage('render.artists'):
+            patched = 0
+            for curve in curves:
+                collection = self.collections[self.collection_of[curve]]
+                samples = self.scene.curve_samples(curve)
+                collection.get_paths()[self.path_slot[curve]].vertices = samples
+                collection.stale = True
+                patched += len(samples)
+            profiler.count('render.samples', patched)
+            if self.scene.show_hull[curves].any():
+                self.render_hulls()
+            self.render_selection()
+
+    def render_hulls(self):
+        with profiler.stage('render.hull'):
+            curves = np.nonzero(self.scene.show_hull)[0]
+            self.hull_collection.set_segments([self.scene.hull(curve) for curve in curves])
+
+    def select(self, curve):
+        self.selected = curve
+        self.render_selection()
+
+    def render_selection(self):
+        if self.selected < 0 or self.selected >= len(self.scene):
+            self.control_line.set_data([], [])
+            return
+        points = self.scene.curve_points(self.selected)
+        self.control_line.set_data(points[:, 0], points[:, 1])
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class PointGrid:
+    """Uniform grid hash over control points, kept up to date point by point"""
+    
+    def __init__(self, points, cell_size):
+        self.cell_size = cell_size
+        self.build(points)
+    
+    def cell_of(self, point):
+        return (int(np.floor(point[0] / self.cell_size)), int(np.floor(point[1] / self.cell_size)))
+    
+    def build(self, points):
+        self.cells = {}
+        keys = np.floor(np.asarray(points) / self.cell_size).astype(np.int64)
+        self.point_cells = [tuple(key) for key in keys.tolist()]
+        for index, key in enumerate(self.point_cells):
+            self.cells.setdefault(key, set()).add(index)
+    
+    def move(self, index, point):
+        key = self.cell_of(point)
+        old_key = self.point_cells[index]
+        if key == old_key:
+            return
+        
+        bucket = self.cells[old_key]
+        bucket.discard(index)
+        if not bucket:
+            del self.cells[old_key]
+        self.cells.setdefault(key, set()).add(index)
+        self.point_cells[index] = key
+    
+    def append(self, point):
+        key = self.cell_of(point)
+        self.cells.setdefault(key, set()).add(len(self.point_cells))
+        self.point_cells.append(key)
+    
+    def remove_last(self):
+        index = len(self.point_cells) - 1
+        key = self.point_cells.pop()
+        bucket = self.cells[key]
+        bucket.discard(index)
+        if not bucket:
+            del self.cells[key]
+    
+    def candidates(self, x, y, radius):
+        cx, cy = self.cell_of((x, y))
+        reach = int(np.ceil(radius / self.cell_size))
+        found = []
+        for ix in range(cx - reach, cx + reach + 1):
+            for iy in range(cy - reach, cy + reach + 1):
+                bucket = self.cells.get((ix, iy))
+                if bucket:
+                    found.extend(bucket)
+        return np.fromiter(found, dtype=np.intp, count=len(found))
+    
+    def nearest(self, points, x, y, max_distance):
+        """Index of the closest point within max_distance, or -1"""
+        found = self.candidates(x, y, max_distance)
+        if len(found) == 0:
+            return -1
+        
+        offsets = points[found] - (x, y)
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        best = np.argmin(distances)
+        return int(found[best]) if distances[best] < max_distance else -1